@@ -0,0 +1,7 @@
+"""Core library behind the Streamlit app: document ingestion, Gemini task
+extraction, Jira and GitHub integration and the test case pipeline.
+
+Submodules are imported on demand and the heavy third-party clients (PyPDF2,
+docx2txt, google.generativeai, PyGithub) only load when first used, so
+`import ai_project_manager.tasks` and the CLI start quickly.
+"""
@@ -0,0 +1,178 @@
+"""Headless batch mode: run the whole workflow for many documents"""
+import argparse
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import JIRA_PROJECT_KEY, GITHUB_REPO
+from .documents import clean_text, extract_text_from_file
+from .github_api import collect_branch_names, create_github_branches_bulk, sanitize_branch_name
+from .jira import create_jira_issues_bulk, record_jira_sync_state
+from .llm import get_llm_cache_state
+from .resilience import get_service_guards
+from .summarize import summarize_with_gemini
+from .tasks import count_tasks, derived_task_id, ensure_task_ids, save_tasks
+from .testcases import collect_test_case_tickets, run_test_case_pipeline
+
+# NEW FUNCTIONALITY 15: HEADLESS BATCH CLI
+# `python -m ai_project_manager spec.pdf specs/ --project ABC --repo org/repo`
+# (or `python enhanced_jira_app.py ...`)
+# runs the whole workflow without Streamlit and prints a JSON report.
+CLI_MAX_DOCUMENTS = int(os.getenv("CLI_MAX_DOCUMENTS", "4"))
+SUPPORTED_EXTENSIONS = ("docx", "pdf", "txt")
+
+def expand_document_paths(paths):
+    """Files given directly plus the supported documents inside given directories"""
+    documents = []
+    for path in paths:
+        if os.path.isdir(path):
+            documents.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.rsplit(".", 1)[-1].lower() in SUPPORTED_EXTENSIONS
+            )
+        else:
+            documents.append(path)
+    return documents
+
+def process_document(path, project_key=None, repo_name=None, steps=("jira", "branches", "tests"),
+                     test_branch=None, summary_dir="summaries", output_dir="test_cases"):
+    """Run extraction -> summary -> Jira -> branches -> tests for one document.
+
+    Has no UI state, so several documents can run on threads at
+    once; all of them share the API throttles and the workflow journal, so a
+    re-run resumes. Returns a JSON-serializable report. With test_branch the
+    tests are not run here: the report's "test_tickets" go to one shared
+    pipeline run (see run_shared_test_branch) so the branch gets one commit.
+    """
+    report = {"document": path, "status": "ok", "tasks": 0, "summary_file": None, "error": None}
+    # The tree id is the id of the document itself (the empty outline path).
+    # A short piece of it keeps a/spec.pdf, b/spec.pdf and spec.docx apart in
+    # branch names, ticket keys and output files.
+    tree_id = derived_task_id(os.path.abspath(path), (), "")
+    name = os.path.splitext(os.path.basename(path))[0]
+    namespace = f"{sanitize_branch_name(name)}_{tree_id[:6]}"
+    try:
+        file_type = path.rsplit(".", 1)[-1].lower()
+        if file_type not in SUPPORTED_EXTENSIONS:
+            raise ValueError(f"Unsupported file type '{file_type}'")
+        with open(path, "rb") as f:
+            text = extract_text_from_file(f.read(), file_type)
+        if not text or not text.strip():
+            raise ValueError("No text could be extracted")
+
+        summary = summarize_with_gemini(clean_text(text))
+        if not summary:
+            raise ValueError("Gemini returned no summary")
+        # Ids derived from the document keep journal entries valid across re-runs
+        tasks = ensure_task_ids(json.loads(summary).get("tasks", []), namespace=os.path.abspath(path))
+        report["tasks"] = sum(count_tasks(tasks))
+
+        os.makedirs(summary_dir, exist_ok=True)
+        report["summary_file"] = os.path.join(summary_dir, f"{namespace}.json")
+        save_tasks(tasks, tree_id, report["summary_file"])
+
+        jira_keys = {}
+        if "jira" in steps:
+            results = create_jira_issues_bulk(tasks, project_key=project_key)
+            record_jira_sync_state(tasks, results, project_key, tree_id)
+            jira_keys = {result["title"]: result["key"] for result in results if result["key"]}
+            report["jira"] = {
+                "created": sum(1 for result in results if result["key"] and not result["resumed"]),
+                "resumed": sum(1 for result in results if result["resumed"]),
+                "failed": [
+                    {"title": result["title"], "error": result["error"]}
+                    for result in results if not result["key"]
+                ]
+            }
+
+        if "branches" in steps:
+            created, existing, failed = create_github_branches_bulk(
+                collect_branch_names(tasks, namespace=namespace), repo_name=repo_name
+            )
+            report["branches"] = {"created": len(created), "existing": len(existing), "failed": failed}
+
+        if "tests" in steps:
+            # Prefix ticket keys and branches with the document so different specs don't collide
+            tickets = collect_test_case_tickets(
+                tasks, f"{namespace}_T", jira_keys=jira_keys, branch_namespace=namespace
+            )
+            if test_branch:
+                report["test_tickets"] = tickets
+            else:
+                report["tests"] = run_test_case_pipeline(tickets, repo_name=repo_name, output_dir=output_dir)
+
+        failures = [
+            report.get("jira", {}).get("failed"),
+            report.get("branches", {}).get("failed"),
+            "tests" in report and pipeline_failed(report["tests"])
+        ]
+        if any(failures):
+            report["status"] = "partial"
+    except Exception as e:
+        report["status"] = "failed"
+        report["error"] = str(e)
+    return report
+
+def pipeline_failed(summary):
+    return bool(summary["failed"] or summary["push_failed"] or summary["comment_failed"])
+
+def run_shared_test_branch(reports, repo_name, test_branch, output_dir="test_cases"):
+    """Run the test cases of every document as one pipeline pushing one commit to test_branch.
+
+    Documents pushing to the same branch in parallel would race on its head.
+    Returns the pipeline summary, or None when no document got that far.
+    """
+    tickets = [ticket for report in reports for ticket in report.pop("test_tickets", [])]
+    if not tickets:
+        return None
+    return run_test_case_pipeline(tickets, repo_name=repo_name, single_branch=test_branch, output_dir=output_dir)
+
+def run_cli(argv=None):
+    """Process documents concurrently, print a JSON report and return the exit code"""
+    parser = argparse.ArgumentParser(description="Turn project documents into Jira issues, branches and test cases.")
+    parser.add_argument("documents", nargs="+", help="Document files (.docx, .pdf, .txt) or directories of them")
+    parser.add_argument("--project", default=JIRA_PROJECT_KEY, help="Jira project key (default: JIRA_PROJECT_KEY)")
+    parser.add_argument("--repo", default=GITHUB_REPO, help="GitHub repository (default: GITHUB_REPO)")
+    parser.add_argument("--skip", action="append", choices=["jira", "branches", "tests"], default=[],
+                        help="Skip a step; can be repeated")
+    parser.add_argument("--test-branch", help="Push every test case to this single branch")
+    parser.add_argument("--jobs", type=int, default=CLI_MAX_DOCUMENTS, help="Documents processed at once")
+    parser.add_argument("--summary-dir", default="summaries", help="Where each document's task JSON is written")
+    parser.add_argument("--output-dir", default="test_cases", help="Where test case files are written")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the Gemini response cache")
+    args = parser.parse_args(argv)
+
+    # notify() falls back to logging outside Streamlit; keep stdout for the report
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+
+    if args.no_cache:
+        get_llm_cache_state()["bypass"] = True
+    steps = tuple(step for step in ("jira", "branches", "tests") if step not in args.skip)
+    if "jira" in steps and not args.project:
+        parser.error("--project (or JIRA_PROJECT_KEY) is required unless --skip jira")
+    if {"branches", "tests"} & set(steps) and not args.repo:
+        parser.error("--repo (or GITHUB_REPO) is required unless --skip branches --skip tests")
+
+    documents = expand_document_paths(args.documents)
+    with ThreadPoolExecutor(max_workers=max(args.jobs, 1)) as executor:
+        reports = list(executor.map(
+            lambda path: process_document(
+                path,
+                project_key=args.project,
+                repo_name=args.repo,
+                steps=steps,
+                test_branch=args.test_branch,
+                summary_dir=args.summary_dir,
+                output_dir=args.output_dir
+            ),
+            documents
+        ))
+    output = {"documents": reports}
+    if "tests" in steps and args.test_branch:
+        output["tests"] = run_shared_test_branch(reports, args.repo, args.test_branch, args.output_dir)
+
+    output["api"] = {name: guard.metrics for name, guard in get_service_guards().items()}
+    print(json.dumps(output, indent=2, ensure_ascii=False))
+    ok = all(report["status"] == "ok" for report in reports)
+    return 0 if ok and not (output.get("tests") and pipeline_failed(output["tests"])) else 1
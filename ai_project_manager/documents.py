@@ -0,0 +1,130 @@
+"""Text extraction from .docx, .pdf and .txt documents.
+
+Extractors take either a file path or an in-memory buffer (bytes, bytearray
+or memoryview). The parsers are imported on first use.
+"""
+import hashlib
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .feedback import notify
+
+def is_bytes_like(source):
+    return isinstance(source, (bytes, bytearray, memoryview))
+
+def extract_text_from_docx(source):
+    import docx2txt
+
+    return docx2txt.process(io.BytesIO(source) if is_bytes_like(source) else source)
+
+def extract_text_from_pdf(source):
+    """Extract text from a PDF file or buffer."""
+    try:
+        # Form feed keeps page boundaries visible to the summary chunker
+        text = "\f".join(iter_pdf_pages(source))
+        # Scanned, image-only PDFs have no text layer; don't pass the bare form feeds on
+        return text if text.strip() else ""
+    except Exception as e:
+        notify("error", f"Error extracting text from PDF: {e}")
+        return None
+
+# Large PDFs are extracted in page ranges on a process pool
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "50"))
+PDF_MAX_PROCESSES = int(os.getenv("PDF_MAX_PROCESSES", str(min(os.cpu_count() or 1, 8))))
+PDF_PAGES_PER_RANGE = 10
+pdf_worker_reader = None  # Set once per worker process by init_pdf_worker
+
+def open_pdf_reader(source):
+    """PdfReader over a path or an in-memory buffer"""
+    import PyPDF2
+
+    return PyPDF2.PdfReader(io.BytesIO(source) if is_bytes_like(source) else source)
+
+def init_pdf_worker(source):
+    """Open the PDF once per worker process instead of once per page range"""
+    global pdf_worker_reader
+    pdf_worker_reader = open_pdf_reader(source)
+
+def extract_pdf_page_range(start, stop, pdf_reader=None):
+    """Text of pages [start, stop); uses the worker's reader unless one is given"""
+    pdf_reader = pdf_reader or pdf_worker_reader
+    return [pdf_reader.pages[idx].extract_text() or "" for idx in range(start, stop)]
+
+def iter_pdf_pages(source, max_processes=None):
+    """Yield the text of each PDF page in order without building one big string.
+
+    Small files are read serially. Large ones are split into page ranges
+    extracted on a process pool, with only a bounded window of ranges in
+    flight so memory stays proportional to the window, not the document.
+    A range that fails in a worker is re-extracted in this process.
+    """
+    max_processes = max_processes or PDF_MAX_PROCESSES
+    pdf_reader = open_pdf_reader(source)
+    page_count = len(pdf_reader.pages)
+    if page_count < PDF_PARALLEL_MIN_PAGES or max_processes <= 1:
+        for page in pdf_reader.pages:
+            yield page.extract_text() or ""
+        return
+
+    ranges = deque(
+        (start, min(start + PDF_PAGES_PER_RANGE, page_count))
+        for start in range(0, page_count, PDF_PAGES_PER_RANGE)
+    )
+    # Workers get the document once at start-up; a memoryview can't be pickled
+    worker_source = bytes(source) if isinstance(source, memoryview) else source
+    with ProcessPoolExecutor(max_workers=max_processes, initializer=init_pdf_worker,
+                             initargs=(worker_source,)) as pool:
+        in_flight = deque()
+        while ranges or in_flight:
+            while ranges and len(in_flight) < max_processes * 2:
+                start, stop = ranges.popleft()
+                in_flight.append((start, stop, pool.submit(extract_pdf_page_range, start, stop)))
+
+            start, stop, future = in_flight.popleft()
+            try:
+                pages = future.result()
+            except Exception:
+                pages = extract_pdf_page_range(start, stop, pdf_reader)
+            yield from pages
+
+def extract_text_from_txt(source):
+    """Extract text from a TXT file or buffer."""
+    try:
+        if is_bytes_like(source):
+            return str(source, encoding='utf-8')
+        with open(source, 'r', encoding='utf-8') as file:
+            return file.read()
+    except Exception as e:
+        notify("error", f"Error extracting text from TXT: {e}")
+        return None
+
+def extract_text_from_file(source, file_type):
+    """Extract text from a file path or in-memory buffer based on its type."""
+    if file_type == 'docx':
+        return extract_text_from_docx(source)
+    elif file_type == 'pdf':
+        return extract_text_from_pdf(source)
+    elif file_type == 'txt':
+        return extract_text_from_txt(source)
+    else:
+        notify("error", f"Unsupported file type: {file_type}")
+        return None
+
+def prrse_tasks(text):
+    lines = text.split('\n')
+    return [line for line in lines if line.strip() != '']
+
+def clean_text(text):
+    return text.encode("utf-8", errors="ignore").decode("utf-8", errors="ignore")
+
+def document_hash(buffer):
+    return hashlib.sha256(buffer).hexdigest()
+
+def ingest_document(file_type, buffer):
+    """Extract, clean and split a document; returns (text, cleaned_text, lines) or Nones"""
+    text = extract_text_from_file(buffer, file_type)
+    if not text or not text.strip():
+        return None, None, None
+    return text, clean_text(text), prrse_tasks(text)
@@ -0,0 +1,22 @@
+"""User-facing messages from core code.
+
+The core never imports Streamlit. When a Streamlit script is running on the
+current thread messages are shown on the page, otherwise they are logged,
+so scripts and the CLI stay fast to import and quiet.
+"""
+import logging
+import sys
+
+logger = logging.getLogger("ai_project_manager")
+
+LOG_LEVELS = {"error": logging.ERROR, "warning": logging.WARNING, "success": logging.INFO, "info": logging.INFO}
+
+def notify(level, message):
+    """Show message with st.error/st.warning/st.success/st.info, or log it"""
+    st = sys.modules.get("streamlit")
+    if st is not None and st.runtime.exists():
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        if get_script_run_ctx(suppress_warning=True) is not None:
+            getattr(st, level)(message)
+            return
+    logger.log(LOG_LEVELS[level], message)
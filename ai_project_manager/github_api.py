@@ -0,0 +1,295 @@
+"""GitHub client (PyGithub, imported on first use), branches and pushes"""
+import json
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+
+from .config import GITHUB_TOKEN, GITHUB_REPO
+from .feedback import notify
+from .journal import journal_record, journal_completed
+from .resilience import get_service_guard
+from .tasks import visit_subtrees
+
+def github_call(fn, *args, **kwargs):
+    """Run a PyGithub call through the GitHub throttle and retry policy"""
+    return get_service_guard("github").call(fn, *args, **kwargs)
+
+# GITHUB CLIENT
+GITHUB_CACHE_TTL = int(os.getenv("GITHUB_CACHE_TTL", "600"))  # seconds
+
+@lru_cache(maxsize=None)
+def get_github_client():
+    """Process-wide authenticated GitHub client, kept across Streamlit reruns.
+
+    PyGithub's own retries and request spacing are disabled; github_call()
+    applies the shared throttle and retry policy instead.
+    """
+    from github import Github
+    return Github(GITHUB_TOKEN, retry=None, seconds_between_requests=None, seconds_between_writes=None)
+
+@lru_cache(maxsize=None)
+def get_github_cache_store():
+    """Repository objects and base-branch SHAs, shared across sessions and reruns"""
+    return {}, threading.Lock()
+
+def get_cached_github_value(cache_key, loader):
+    """Return a cached GitHub lookup, calling loader() on a miss or after the TTL"""
+    github_cache, github_lock = get_github_cache_store()
+    now = time.monotonic()
+    with github_lock:
+        entry = github_cache.get(cache_key)
+    if entry and now - entry[0] < GITHUB_CACHE_TTL:
+        return entry[1]
+
+    value = loader()
+    with github_lock:
+        github_cache[cache_key] = (now, value)
+    return value
+
+def invalidate_github_cache(repo_name=None, base=None):
+    """Forget cached repositories and SHAs for one repo, or for all of them.
+
+    With base, only that branch's cached head SHA is dropped.
+    """
+    github_cache, github_lock = get_github_cache_store()
+    with github_lock:
+        if repo_name is None:
+            github_cache.clear()
+        elif base is not None:
+            github_cache.pop(("base_sha", repo_name, base), None)
+        else:
+            for cache_key in list(github_cache):
+                if cache_key[1] == repo_name:
+                    del github_cache[cache_key]
+
+def get_github_repo(repo_name):
+    """Repository object for repo_name, fetched once per run"""
+    return get_cached_github_value(("repo", repo_name), lambda: github_call(get_github_client().get_repo, repo_name))
+
+def get_base_branch_sha(repo_name, base="main"):
+    """Head commit SHA of the base branch new feature branches start from"""
+    return get_cached_github_value(
+        ("base_sha", repo_name, base),
+        lambda: github_call(get_github_repo(repo_name).get_branch, base).commit.sha
+    )
+
+def get_github_rate_limit():
+    """Remaining and total core API calls for the token, as (remaining, limit)"""
+    try:
+        return get_github_client().rate_limiting
+    except Exception:
+        return None, None
+
+def get_github_repos():
+    """Fetch available GitHub repositories"""
+    try:
+        user = get_github_client().get_user()
+        # Pages are fetched lazily while iterating, so retry the whole listing
+        return github_call(lambda: [(repo.full_name, repo.name) for repo in user.get_repos()])
+    except Exception as e:
+        notify("error", f"Failed to fetch GitHub repos: {e}")
+    return []
+
+def create_github_repo(repo_name, description="", private=False):
+    """Create a new GitHub repository"""
+    try:
+        user = get_github_client().get_user()
+        repo = github_call(
+            user.create_repo,
+            idempotent=False,
+            name=repo_name,
+            description=description,
+            private=private,
+            auto_init=True
+        )
+        # A repo recreated under an old name must not reuse the old object or SHAs
+        invalidate_github_cache(repo.full_name)
+        return True, repo.full_name
+    except Exception as e:
+        # Check for duplicate repo name error
+        try:
+            if hasattr(e, 'data') and e.data:
+                error_json = e.data
+            else:
+                error_json = json.loads(str(e).split(':', 1)[-1].strip())
+            if (
+                isinstance(error_json, dict) and
+                error_json.get('errors') and
+                any(err.get('message', '').lower().find('name already exists') != -1 for err in error_json['errors'])
+            ):
+                # notify("error", "A repository with that name already exists on this account.")
+                return False, "A repository with that name already exists on this account please try with different name."
+        except Exception:
+            pass
+        return False, f"Failed to create repository: {str(e)}"
+
+# NEW FUNCTIONALITY 6: BULK GITHUB BRANCH CREATION
+GITHUB_BRANCH_BATCH_SIZE = int(os.getenv("GITHUB_BRANCH_BATCH_SIZE", "50"))
+
+def feature_branch_name(path, title, namespace=None):
+    """feature_1_2_3_<title> for the node at outline path (1, 2, 3).
+
+    A namespace (e.g. the source document) goes after "feature_" so
+    several documents can share one repository without colliding.
+    """
+    numbers = "_".join(str(position) for position in path)
+    prefix = f"feature_{sanitize_branch_name(namespace)}_" if namespace else "feature_"
+    return f"{prefix}{numbers}_{sanitize_branch_name(title)}".lower()
+
+def collect_branch_names(tasks_data, namespace=None):
+    """Feature branch names for every node at any depth, in tree order"""
+    return visit_subtrees(tasks_data, lambda path, task, parent: feature_branch_name(path, task["title"], namespace))
+
+def build_create_refs_mutation(count):
+    """GraphQL mutation creating `count` refs, one aliased createRef per branch"""
+    declarations = ["$repositoryId: ID!", "$oid: GitObjectID!"]
+    fields = []
+    for idx in range(count):
+        declarations.append(f"$name{idx}: String!")
+        fields.append(
+            f"  b{idx}: createRef(input: {{repositoryId: $repositoryId, name: $name{idx}, oid: $oid}}) "
+            "{ ref { name } }"
+        )
+    return f"mutation({', '.join(declarations)}) {{\n" + "\n".join(fields) + "\n}"
+
+def create_github_branches_bulk(branch_names, base="main", repo_name=None, progress_callback=None):
+    """Create many branches from one base SHA with batched GraphQL createRef mutations.
+
+    Returns (created, existing, failed): names that were created, names that
+    already existed (including those the workflow journal says an earlier
+    run made, which cost no request), and a dict of other failures to their
+    error message.
+    """
+    if not repo_name:
+        repo_name = GITHUB_REPO
+
+    # Titles can repeat, so drop duplicate branch names while keeping the order
+    branch_names = list(dict.fromkeys(branch_names))
+    journaled = journal_completed("branch", repo_name)
+    existing = [branch_name for branch_name in branch_names if branch_name in journaled]
+    branch_names = [branch_name for branch_name in branch_names if branch_name not in journaled]
+    created, failed = [], {}
+    if not branch_names:
+        return created, existing, failed
+
+    repo = get_github_repo(repo_name)
+    base_sha = get_base_branch_sha(repo_name, base)
+    requester = get_github_client().requester
+
+    for start in range(0, len(branch_names), GITHUB_BRANCH_BATCH_SIZE):
+        batch = branch_names[start:start + GITHUB_BRANCH_BATCH_SIZE]
+        variables = {"repositoryId": repo.node_id, "oid": base_sha}
+        for idx, branch_name in enumerate(batch):
+            variables[f"name{idx}"] = f"refs/heads/{branch_name}"
+
+        try:
+            # Replaying a partly applied batch is safe: done refs come back as "already exists"
+            _, data = github_call(
+                requester.requestJsonAndCheck,
+                "POST",
+                requester.graphql_url,
+                input={"query": build_create_refs_mutation(len(batch)), "variables": variables}
+            )
+        except Exception as e:
+            failed.update({branch_name: str(e) for branch_name in batch})
+            continue
+
+        errors = {}
+        for error in data.get("errors", []):
+            alias = (error.get("path") or [None])[0]
+            errors[alias] = error.get("message", "Unknown error")
+
+        results = data.get("data") or {}
+        for idx, branch_name in enumerate(batch):
+            alias = f"b{idx}"
+            if alias in errors:
+                if "already exists" in errors[alias].lower():
+                    journal_record("branch", repo_name, branch_name, {"base": base})
+                    existing.append(branch_name)
+                else:
+                    failed[branch_name] = errors[alias]
+            elif results.get(alias):
+                journal_record("branch", repo_name, branch_name, {"base": base})
+                created.append(branch_name)
+            else:
+                failed[branch_name] = "Missing from GraphQL response"
+
+        if progress_callback and branch_names:
+            progress_callback(min((start + len(batch)) / len(branch_names), 1.0))
+
+    return created, existing, failed
+
+def ensure_github_branch(repo_name, branch_name, base="main"):
+    """Return the GitRef for branch_name, creating it from the base branch if missing"""
+    from github import GithubException, UnknownObjectException
+
+    repo = get_github_repo(repo_name)
+    try:
+        return github_call(repo.get_git_ref, f"heads/{branch_name}")
+    except UnknownObjectException:
+        pass
+    try:
+        # Not retried on 5xx: the ref may exist even though the call failed
+        return github_call(
+            repo.create_git_ref,
+            idempotent=False,
+            ref=f"refs/heads/{branch_name}",
+            sha=get_base_branch_sha(repo_name, base)
+        )
+    except GithubException as e:
+        if e.status != 422:
+            raise
+        # "Reference already exists": someone (or an earlier attempt) created it meanwhile
+        return github_call(repo.get_git_ref, f"heads/{branch_name}")
+
+@lru_cache(maxsize=None)
+def get_branch_locks():
+    """(repo, branch) -> Lock, plus the lock guarding that dict"""
+    return {}, threading.Lock()
+
+def get_branch_lock(repo_name, branch_name):
+    """Lock serializing commits to one branch within this process"""
+    locks, guard = get_branch_locks()
+    with guard:
+        return locks.setdefault((repo_name, branch_name), threading.Lock())
+
+def push_files_to_branch(repo_name, branch_name, files, message, create_branch=False):
+    """Commit every file in `files` (path -> content) to a branch as one commit.
+
+    Uses the Git Data API: the tree is built on top of the branch head with
+    the file contents inline, so GitHub creates the blobs itself and no
+    per-file sha lookup is needed. Pushes to the same branch take turns, so
+    concurrent callers never build on a head another one just moved.
+    """
+    from github import InputGitTreeElement
+
+    try:
+        repo = get_github_repo(repo_name)
+        with get_branch_lock(repo_name, branch_name):
+            if create_branch:
+                ref = ensure_github_branch(repo_name, branch_name)
+            else:
+                ref = github_call(repo.get_git_ref, f"heads/{branch_name}")
+            parent = github_call(repo.get_git_commit, ref.object.sha)
+
+            elements = [
+                InputGitTreeElement(path=file_path, mode="100644", type="blob", content=content)
+                for file_path, content in files.items()
+            ]
+            # Trees are content-addressed and the ref update is a plain set, so retries are safe
+            tree = github_call(repo.create_git_tree, elements, base_tree=parent.tree)
+            commit = github_call(repo.create_git_commit, message, tree, [parent])
+            github_call(ref.edit, commit.sha)
+            # New branches must start from the new head if this was a base branch
+            invalidate_github_cache(repo_name, base=branch_name)
+
+        return True, f"Successfully pushed {len(files)} test case files to {branch_name}"
+    except Exception as e:
+        return False, f"Failed to push test cases: {str(e)}"
+
+def sanitize_branch_name(name):
+    name = name.replace(" ", "_")
+    name = re.sub(r'[^a-zA-Z0-9_\-\/]', '', name)
+    return name
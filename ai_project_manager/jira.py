@@ -0,0 +1,702 @@
+"""Jira REST client, metadata cache and issue creation/sync"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import JIRA_BASE_URL, JIRA_EMAIL, JIRA_API_TOKEN, JIRA_PROJECT_KEY
+from .feedback import notify
+from .journal import journal_record, journal_completed
+from .resilience import get_service_guard
+from .tasks import ensure_task_ids, walk_tasks
+
+# JIRA HTTP CLIENT
+JIRA_TIMEOUT = float(os.getenv("JIRA_TIMEOUT", "30"))  # seconds per request
+JIRA_MAX_WORKERS = int(os.getenv("JIRA_MAX_WORKERS", "8"))
+
+class JiraClient:
+    """Jira REST client that reuses one keep-alive session for every call"""
+
+    def __init__(self, base_url, email, api_token, pool_size=None, timeout=None):
+        self.base_url = (base_url or "").rstrip("/")
+        self.timeout = timeout or JIRA_TIMEOUT
+        self.session = requests.Session()
+        self.session.auth = (email, api_token)
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Content-Type": "application/json"
+        })
+        # Every Jira call goes to one host, so size the pool for the concurrent workers
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size or max(JIRA_MAX_WORKERS, 10))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, path, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        # A create or comment that failed with a 5xx may have been applied, so only replay safe methods
+        return get_service_guard("jira").call(
+            self.session.request, method, f"{self.base_url}{path}",
+            idempotent=method in ("GET", "PUT", "DELETE"), **kwargs
+        )
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+@lru_cache(maxsize=None)
+def get_jira_client():
+    """Process-wide Jira client, kept across Streamlit reruns"""
+    return JiraClient(JIRA_BASE_URL, JIRA_EMAIL, JIRA_API_TOKEN)
+
+# JIRA METADATA CACHE
+# Process-wide cache for Jira metadata so a run doesn't refetch it per issue
+JIRA_METADATA_TTL = int(os.getenv("JIRA_METADATA_TTL", "600"))  # seconds
+
+@lru_cache(maxsize=None)
+def get_jira_metadata_store():
+    """Metadata dict and its lock, shared across sessions and Streamlit reruns"""
+    return {}, threading.Lock()
+
+def get_cached_jira_metadata(kind, loader, project_key=None):
+    """Return cached Jira metadata, calling loader() on a miss or after the TTL"""
+    jira_metadata_cache, jira_metadata_lock = get_jira_metadata_store()
+    cache_key = (JIRA_BASE_URL, project_key, kind)
+    now = time.monotonic()
+    with jira_metadata_lock:
+        entry = jira_metadata_cache.get(cache_key)
+    if entry and now - entry[0] < JIRA_METADATA_TTL:
+        return entry[1]
+
+    value = loader()
+    if value:  # Failed lookups come back empty and should be retried next time
+        with jira_metadata_lock:
+            jira_metadata_cache[cache_key] = (now, value)
+    return value
+
+def invalidate_jira_metadata_cache(project_key=None):
+    """Drop cached metadata for a project (plus the project list), or everything"""
+    jira_metadata_cache, jira_metadata_lock = get_jira_metadata_store()
+    with jira_metadata_lock:
+        if project_key is None:
+            jira_metadata_cache.clear()
+            return
+        for cache_key in list(jira_metadata_cache):
+            _, key_project, kind = cache_key
+            if key_project == project_key or kind == "projects":
+                del jira_metadata_cache[cache_key]
+
+# NEW FUNCTIONALITY 2: PROJECT SELECTION INTERFACE
+def fetch_jira_projects():
+    try:
+        response = get_jira_client().get("/rest/api/3/project")
+        if response.status_code == 200:
+            projects = response.json()
+            return [(p["key"], p["name"]) for p in projects]
+        else:
+            notify("error", f"Failed to fetch Jira projects: {response.status_code}")
+    except Exception as e:
+        notify("error", f"Failed to fetch Jira projects: {e}")
+    return []
+
+def get_jira_projects():
+    """Fetch available Jira projects"""
+    return get_cached_jira_metadata("projects", fetch_jira_projects)
+def fetch_jira_account_id():
+    try:
+        response = get_jira_client().get("/rest/api/3/myself")
+        if response.status_code == 200:
+            return response.json().get("accountId")
+        else:
+            notify("error", f"Failed to fetch Jira accountId: {response.text}")
+    except Exception as e:
+        notify("error", f"Error fetching Jira accountId: {e}")
+    return None
+
+def get_jira_account_id():
+    """Fetch the Atlassian accountId for the current Jira user."""
+    return get_cached_jira_metadata("account_id", fetch_jira_account_id)
+
+def create_jira_project(project_key, project_name, project_type="software"):
+    """Create a new Jira project"""
+    # Select correct template key based on project_type
+    template_keys = {
+        "software": "com.pyxis.greenhopper.jira:gh-simplified-agility-scrum",
+        "business": "com.atlassian.jira-core-project-templates:jira-core-simplified-process-control",
+        "service_desk": "com.atlassian.servicedesk:simplified-it-service-management"
+    }
+    projectTemplateKey = template_keys.get(project_type, template_keys["software"])
+
+    # Get the accountId for the project lead
+    lead_account_id = get_jira_account_id()
+    if not lead_account_id:
+        return False, "Could not fetch Jira accountId for project lead."
+
+    payload = {
+        "key": project_key,
+        "name": project_name,
+        "projectTypeKey": project_type,
+        "projectTemplateKey": projectTemplateKey,
+        "leadAccountId": lead_account_id
+    }
+
+    try:
+        response = get_jira_client().post("/rest/api/3/project", json=payload)
+        if response.status_code == 201:
+            invalidate_jira_metadata_cache(project_key)
+            return True, response.json()
+        else:
+            # Check for duplicate project name/key error
+            try:
+                error_json = response.json()
+                if (
+                    'errors' in error_json and (
+                        'projectName' in error_json['errors'] or 'projectKey' in error_json['errors']
+                    )
+                ):
+                    # notify("error", "A project with that name or key already exists.")
+                    return False, "A project with that name or key already exists please try with different name or key."
+            except Exception:
+                pass
+            return False, f"Failed to create project: {response.text}"
+    except Exception as e:
+        return False, f"Error creating project: {str(e)}"
+
+# Your existing Jira and GitHub functions (keeping them all)
+def fetch_valid_issue_types():
+    response = get_jira_client().get("/rest/api/3/issuetype")
+    if response.status_code == 200:
+        return [item["name"] for item in response.json()]
+    return []
+
+def get_valid_issue_types(project_key=None):
+    """Issue type names, cached for the run per base URL and project"""
+    return get_cached_jira_metadata("issue_types", fetch_valid_issue_types, project_key)
+
+# Issue type for each level of the task tree. Jira can't nest below the last
+# type (a Subtask has no children), so deeper nodes become issues of the last
+# type under their nearest ancestor one Jira level up.
+JIRA_LEVEL_ISSUE_TYPES = tuple(
+    name.strip() for name in os.getenv("JIRA_LEVEL_ISSUE_TYPES", "Epic,Task,Subtask").split(",") if name.strip()
+)
+
+def jira_issue_level(depth):
+    """Index into JIRA_LEVEL_ISSUE_TYPES for a node at depth (0 = top level)"""
+    return min(depth, len(JIRA_LEVEL_ISSUE_TYPES) - 1)
+
+def jira_issue_type_for_level(level, valid_types):
+    issue_type_name = JIRA_LEVEL_ISSUE_TYPES[level]
+    if issue_type_name not in valid_types:
+        notify("warning", f"⚠️ Issue type '{issue_type_name}' is invalid. Falling back to 'Task'.")
+        issue_type_name = "Task"
+    return issue_type_name
+
+def plan_jira_nodes(tasks_data):
+    """Scheduling nodes for every task at any depth, parents before children.
+
+    A node's "parent" is the node its issue hangs off in Jira: the tree
+    parent, or for levels deeper than JIRA_LEVEL_ISSUE_TYPES the ancestor
+    one Jira level up. Such deep nodes keep the titles of the levels folded
+    away in their issue summary ("Subtask › Deeper item").
+    """
+    nodes = []
+    by_path = {}
+    for path, task, _ in walk_tasks(tasks_data):
+        level = jira_issue_level(len(path) - 1)
+        parent = by_path[path[:level]] if level else None
+        folded = [by_path[path[:depth]]["title"] for depth in range(level + 1, len(path))]
+        node = {
+            "task": task,
+            "path": path,
+            "parent": parent,
+            "level": level,
+            "title": task["title"],
+            "summary": " › ".join(folded + [task["title"]]),
+            "children": [],
+            "key": None,
+            "issue_type": None,
+            "error": None
+        }
+        if parent:
+            parent["children"].append(node)
+        by_path[path] = node
+        nodes.append(node)
+    return nodes
+
+def prepare_jira_payload(node, project_key, valid_types):
+    """Set the node's issue type and create payload once its Jira parent has a key"""
+    parent_key = node["parent"]["key"] if node["parent"] else None
+    node["issue_type"] = jira_issue_type_for_level(node["level"], valid_types)
+    node["payload"] = build_jira_issue_payload(
+        node["summary"],
+        node["task"].get("description") or "",
+        node["issue_type"],
+        project_key,
+        parent_key
+    )
+
+def build_jira_description(description):
+    """Wrap plain text in the Atlassian document format Jira v3 expects"""
+    return {
+        "type": "doc",
+        "version": 1,
+        "content": [
+            {
+                "type": "paragraph",
+                "content": [{"type": "text", "text": description or ""}]
+            }
+        ]
+    }
+
+def build_jira_issue_payload(summary, description, issue_type_name, project_key, parent_id=None):
+    """Build the create-issue fields payload used by single and bulk creation"""
+    payload = {
+        "fields": {
+            "project": {"key": project_key},
+            "summary": summary,
+            "description": build_jira_description(description),
+            "issuetype": {"name": issue_type_name}
+        }
+    }
+
+    if parent_id:
+        payload["fields"]["parent"] = {"key": parent_id}
+    return payload
+
+def post_jira_issue(payload):
+    """POST a single issue payload, returning (issue_key, error_text)"""
+    response = get_jira_client().post("/rest/api/3/issue", json=payload)
+    if response.status_code == 201:
+        return response.json().get("key"), None
+    return None, response.text
+
+# NEW FUNCTIONALITY 4: BULK JIRA ISSUE CREATION
+JIRA_BULK_LIMIT = 50  # Jira Cloud rejects bulk requests with more than 50 issues
+
+def format_jira_element_errors(element_errors):
+    """Flatten a bulk-create elementErrors block into a readable message"""
+    messages = list(element_errors.get("errorMessages", []))
+    messages.extend(f"{field}: {msg}" for field, msg in element_errors.get("errors", {}).items())
+    return "; ".join(messages) or "Unknown error"
+
+def post_jira_issues_bulk(payloads):
+    """POST up to JIRA_BULK_LIMIT payloads.
+
+    Returns (results, rejected): one (issue_key, error_text) per payload and
+    the indexes Jira listed in failedElementNumber. Only those are known not
+    to exist; after a failed request or a missing issue the outcome is unknown.
+    """
+
+    try:
+        response = get_jira_client().post("/rest/api/3/issue/bulk", json={"issueUpdates": payloads})
+        data = response.json()
+    except Exception as e:
+        return [(None, f"Bulk request failed: {e}")] * len(payloads), set()
+
+    if response.status_code not in (201, 400) or not isinstance(data, dict):
+        return [(None, f"Bulk request failed: {response.text}")] * len(payloads), set()
+
+    failed = {}
+    for error in data.get("errors", []):
+        failed[error.get("failedElementNumber")] = format_jira_element_errors(error.get("elementErrors", {}))
+
+    # Jira returns created issues in request order, skipping the failed elements
+    created = iter(data.get("issues", []))
+    results = []
+    for idx in range(len(payloads)):
+        if idx in failed:
+            results.append((None, failed[idx]))
+        else:
+            issue = next(created, None)
+            results.append((issue.get("key"), None) if issue else (None, "Missing from bulk response"))
+    return results, set(failed)
+
+def post_jira_issues_batch(payloads):
+    """Bulk POST payloads, retrying one by one only the items Jira rejected.
+
+    Items whose outcome is unknown (the whole request failed) are reported
+    as failed rather than retried, since they may have been created and a
+    retry could duplicate them. Returns one (issue_key, error_text) per payload.
+    """
+    results, rejected = post_jira_issues_bulk(payloads)
+    for idx in sorted(rejected):
+        if not 0 <= idx < len(payloads):
+            continue
+        # Fall back to a single POST so one bad item doesn't sink the batch
+        try:
+            results[idx] = post_jira_issue(payloads[idx])
+        except Exception as e:
+            results[idx] = (None, f"{results[idx][1]}; single create failed: {e}")
+    return results
+
+def create_jira_issues_bulk(tasks_data, project_key=None, progress_callback=None):
+    """Create the whole task tree level by level with bulk requests.
+
+    All Epics go out first, then every Task with its Epic key, then every
+    Subtask (see JIRA_LEVEL_ISSUE_TYPES for other mappings). Items the bulk
+    endpoint rejects are retried with a single POST (post_jira_issues_batch),
+    and nodes already created according to the workflow journal are
+    reused. Returns one result dict per node with its path, key and error.
+    """
+    if not project_key:
+        project_key = JIRA_PROJECT_KEY
+
+    valid_types = get_valid_issue_types(project_key)
+    ensure_task_ids(tasks_data)
+    nodes = plan_jira_nodes(tasks_data)
+    total_nodes = len(nodes)
+    journaled = journal_completed("jira", project_key)
+
+    results = []
+    for level in range(len(JIRA_LEVEL_ISSUE_TYPES)):
+        ready = []
+        for node in nodes:
+            if node["level"] != level:
+                continue
+            parent = node["parent"]
+            if parent and not parent["key"]:
+                node["error"] = f"Parent '{parent['title']}' was not created"
+                results.append(node)
+            elif resume_jira_issue(node, journaled):
+                results.append(node)
+            else:
+                prepare_jira_payload(node, project_key, valid_types)
+                ready.append(node)
+
+        for start in range(0, len(ready), JIRA_BULK_LIMIT):
+            batch = ready[start:start + JIRA_BULK_LIMIT]
+            outcomes = post_jira_issues_batch([node["payload"] for node in batch])
+
+            for node, (issue_key, error_text) in zip(batch, outcomes):
+                node["key"] = issue_key
+                node["error"] = error_text
+                if issue_key:
+                    journal_jira_issue(project_key, node)
+                results.append(node)
+
+            if progress_callback and total_nodes:
+                progress_callback(min(len(results) / total_nodes, 1.0))
+
+    if progress_callback:
+        progress_callback(1.0)
+    results.sort(key=lambda node: node["path"])
+    return [jira_creation_result(node) for node in results]
+
+def jira_creation_result(node):
+    """Public view of a scheduled node, shared by the bulk and concurrent creators"""
+    return {
+        "path": node["path"],
+        "title": node["title"],
+        "issue_type": node["issue_type"],
+        "key": node["key"],
+        "error": node["error"],
+        "resumed": node.get("resumed", False)
+    }
+
+def journal_jira_issue(project_key, node):
+    journal_record("jira", project_key, node["task"]["id"],
+                   {"key": node["key"], "issue_type": node["issue_type"], "title": node["title"]})
+
+def resume_jira_issue(node, journaled):
+    """Take the key of an issue the journal says was already created; True if found"""
+    entry = journaled.get(node["task"]["id"])
+    if not entry:
+        return False
+    node.update({"key": entry["key"], "issue_type": entry["issue_type"], "error": None, "resumed": True})
+    return True
+
+# NEW FUNCTIONALITY 5: CONCURRENT JIRA ISSUE CREATION
+
+def create_jira_issues_concurrent(tasks_data, project_key=None, max_workers=None, progress_callback=None):
+    """Create the task tree on a bounded thread pool.
+
+    Siblings are independent, so every node is submitted as soon as its
+    parent's key is known instead of waiting for the whole level. Workers
+    only do the HTTP call; results, session state and progress are handled
+    on the calling (Streamlit script) thread.
+    """
+    if not project_key:
+        project_key = JIRA_PROJECT_KEY
+    max_workers = max_workers or JIRA_MAX_WORKERS
+
+    valid_types = get_valid_issue_types(project_key)
+    ensure_task_ids(tasks_data)
+    nodes = plan_jira_nodes(tasks_data)
+    total_nodes = len(nodes)
+    journaled = journal_completed("jira", project_key)
+    results = []
+    pending = {}
+
+    def submit(executor, node):
+        if resume_jira_issue(node, journaled):
+            results.append(node)
+            for child in node["children"]:
+                submit(executor, child)
+            return
+        prepare_jira_payload(node, project_key, valid_types)
+        pending[executor.submit(post_jira_issue, node["payload"])] = node
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for node in nodes:
+            if node["parent"] is None:
+                submit(executor, node)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = pending.pop(future)
+                try:
+                    node["key"], node["error"] = future.result()
+                except Exception as e:
+                    node["error"] = str(e)
+                results.append(node)
+
+                if node["key"]:
+                    journal_jira_issue(project_key, node)
+                    for child in node["children"]:
+                        submit(executor, child)
+                    continue
+
+                # Nothing below a failed node can be created, report the whole subtree
+                stack = list(node["children"])
+                while stack:
+                    child = stack.pop()
+                    child["error"] = f"Parent '{child['parent']['title']}' was not created"
+                    results.append(child)
+                    stack.extend(child["children"])
+
+            if progress_callback and total_nodes:
+                progress_callback(min(len(results) / total_nodes, 1.0))
+
+    results.sort(key=lambda node: node["path"])
+    return [jira_creation_result(node) for node in results]
+
+# NEW FUNCTIONALITY 13: INCREMENTAL JIRA SYNC
+JIRA_SYNC_STATE_FILE = "jira_sync_state.json"
+
+def task_content_hash(task):
+    """Fingerprint of the node fields that are pushed to Jira"""
+    content = json.dumps([task.get("title") or "", task.get("description") or ""], ensure_ascii=False)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+def jira_sync_scope(project_key, tree_id):
+    """Sync state is kept per project and task tree, so one document never closes another's issues"""
+    return f"{project_key}/{tree_id}"
+
+def load_jira_sync_state(project_key, tree_id):
+    """Node id -> {"key", "hash", "issue_type", "title"} for issues this tree already pushed to a project"""
+    try:
+        with open(JIRA_SYNC_STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f).get(jira_sync_scope(project_key, tree_id), {})
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def save_jira_sync_state(project_key, tree_id, synced):
+    try:
+        with open(JIRA_SYNC_STATE_FILE, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        state = {}
+    state[jira_sync_scope(project_key, tree_id)] = synced
+    with open(JIRA_SYNC_STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+
+def jira_sync_entry(task, issue_key, issue_type):
+    return {"key": issue_key, "hash": task_content_hash(task), "issue_type": issue_type, "title": task["title"]}
+
+@lru_cache(maxsize=None)
+def get_jira_sync_lock():
+    """Serializes read-modify-write of the sync state file across threads"""
+    return threading.Lock()
+
+def record_jira_sync_state(tasks_data, results, project_key, tree_id):
+    """Remember issues made by a full create so a later sync of the same tree updates them instead of duplicating"""
+    ensure_task_ids(tasks_data)
+    created = {result["path"]: result for result in results if result["key"]}
+    with get_jira_sync_lock():
+        synced = load_jira_sync_state(project_key, tree_id)
+        for path, task, _ in walk_tasks(tasks_data):
+            if path in created:
+                synced[task["id"]] = jira_sync_entry(task, created[path]["key"], created[path]["issue_type"])
+        save_jira_sync_state(project_key, tree_id, synced)
+
+def update_jira_issue(issue_key, summary, description):
+    """PUT new summary and description, returning an error text or None"""
+    fields = {"summary": summary, "description": build_jira_description(description)}
+    response = get_jira_client().put(f"/rest/api/3/issue/{issue_key}", json={"fields": fields})
+    if response.status_code == 204:
+        return None
+    return response.text
+
+def close_jira_issue(issue_key):
+    """Transition an issue to a status in the "done" category, returning an error text or None"""
+    client = get_jira_client()
+    response = client.get(f"/rest/api/3/issue/{issue_key}/transitions")
+    if response.status_code == 404:
+        return None  # Already deleted in Jira
+    if response.status_code != 200:
+        return response.text
+
+    transitions = response.json().get("transitions", [])
+    target = next(
+        (t for t in transitions if t.get("to", {}).get("statusCategory", {}).get("key") == "done"),
+        None
+    )
+    if not target:
+        return "No transition to a done status is available"
+
+    response = client.post(f"/rest/api/3/issue/{issue_key}/transitions", json={"transition": {"id": target["id"]}})
+    if response.status_code == 204:
+        return None
+    return response.text
+
+def sync_jira_issues(tasks_data, tree_id, project_key=None, max_workers=None, progress_callback=None):
+    """Bring Jira in line with the task tree using the saved node id -> issue map.
+
+    New nodes are created level by level with bulk requests, nodes whose
+    title or description changed get a PUT, and issues this tree (tree_id,
+    see TaskTree) pushed before whose node was deleted are transitioned to
+    done. Unchanged nodes cost no requests.
+    Returns creation result dicts with an extra "action"
+    (created/updated/unchanged/closed); closed results have no path.
+    """
+    if not project_key:
+        project_key = JIRA_PROJECT_KEY
+    max_workers = max_workers or JIRA_MAX_WORKERS
+
+    ensure_task_ids(tasks_data)
+    synced = load_jira_sync_state(project_key, tree_id)
+    nodes = plan_jira_nodes(tasks_data)
+    live_ids = {node["task"]["id"] for node in nodes}
+
+    # Issues a crashed or interrupted run created for this tree but never
+    # recorded: a PUT brings them up to date instead of creating duplicates.
+    # Other documents' journal entries are left alone.
+    closed_ids = journal_completed("jira_closed", project_key)
+    for node_id, entry in journal_completed("jira", project_key).items():
+        if node_id in live_ids and node_id not in synced and node_id not in closed_ids:
+            synced[node_id] = dict(entry, hash=None)
+
+    creates, updates, results = [], [], []
+    for node in nodes:
+        task = node["task"]
+        entry = synced.get(task["id"])
+        if entry:
+            node.update({"key": entry["key"], "issue_type": entry.get("issue_type")})
+        if not entry:
+            node["action"] = "created"
+            creates.append(node)
+        elif entry["hash"] != task_content_hash(task):
+            node["action"] = "updated"
+            updates.append(node)
+        else:
+            node["action"] = "unchanged"
+            results.append(node)
+
+    removed = {node_id: entry for node_id, entry in synced.items() if node_id not in live_ids}
+    total_changes = len(creates) + len(updates) + len(removed)
+    closed = []
+
+    def report_progress():
+        if progress_callback and total_changes:
+            done_count = sum(1 for node in results if node["action"] != "unchanged") + len(closed)
+            progress_callback(min(done_count / total_changes, 1.0))
+
+    try:
+        # Updates and closes don't depend on each other or on the creates
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {
+                executor.submit(update_jira_issue, node["key"], node["summary"], node["task"].get("description") or ""): node
+                for node in updates
+            }
+            for node_id, entry in removed.items():
+                node = {"path": None, "title": entry.get("title", entry["key"]), "key": entry["key"],
+                        "issue_type": entry.get("issue_type"), "error": None, "action": "closed", "id": node_id}
+                pending[executor.submit(close_jira_issue, entry["key"])] = node
+
+            if creates:
+                valid_types = get_valid_issue_types(project_key)
+            for level in range(len(JIRA_LEVEL_ISSUE_TYPES)):
+                ready = []
+                for node in creates:
+                    if node["level"] != level:
+                        continue
+                    parent = node["parent"]
+                    if parent and not parent["key"]:
+                        node["error"] = f"Parent '{parent['title']}' was not created"
+                        results.append(node)
+                        continue
+                    prepare_jira_payload(node, project_key, valid_types)
+                    ready.append(node)
+
+                for start in range(0, len(ready), JIRA_BULK_LIMIT):
+                    batch = ready[start:start + JIRA_BULK_LIMIT]
+                    outcomes = post_jira_issues_batch([node["payload"] for node in batch])
+                    for node, (issue_key, error_text) in zip(batch, outcomes):
+                        node["key"], node["error"] = issue_key, error_text
+                        if issue_key:
+                            journal_jira_issue(project_key, node)
+                            synced[node["task"]["id"]] = jira_sync_entry(node["task"], issue_key, node["issue_type"])
+                        results.append(node)
+                    report_progress()
+
+            for future in pending:
+                node = pending[future]
+                try:
+                    node["error"] = future.result()
+                except Exception as e:
+                    node["error"] = str(e)
+
+                if node["action"] == "closed":
+                    if not node["error"]:
+                        journal_record("jira_closed", project_key, node["id"], {"key": node["key"]})
+                        del synced[node["id"]]
+                    closed.append(node)
+                else:
+                    if not node["error"]:
+                        synced[node["task"]["id"]] = jira_sync_entry(node["task"], node["key"], node["issue_type"])
+                    results.append(node)
+                report_progress()
+    finally:
+        save_jira_sync_state(project_key, tree_id, synced)
+
+    if progress_callback:
+        progress_callback(1.0)
+    results.sort(key=lambda node: node["path"])
+    return [dict(jira_creation_result(node), action=node["action"]) for node in results + closed]
+
+def add_comment_to_jira_issue(issue_key, comment_content):
+    """Add a comment to a Jira issue"""
+    path = f"/rest/api/3/issue/{issue_key}/comment"
+    
+    payload = {
+        "body": {
+            "type": "doc",
+            "version": 1,
+            "content": [
+                {
+                    "type": "paragraph",
+                    "content": [{"type": "text", "text": comment_content}]
+                }
+            ]
+        }
+    }
+    
+    try:
+        response = get_jira_client().post(path, json=payload)
+        if response.status_code == 201:
+            return True, "Comment added successfully"
+        else:
+            return False, f"Failed to add comment: {response.text}"
+    except Exception as e:
+        return False, f"Error adding comment: {str(e)}"
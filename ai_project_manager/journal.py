@@ -0,0 +1,43 @@
+import json
+import os
+import threading
+import time
+from functools import lru_cache
+
+# NEW FUNCTIONALITY 14: RESUMABLE WORKFLOW JOURNAL
+# Append-only log of completed external side effects (issues, branches,
+# pushes, comments), keyed by step, scope (project, repo...) and node, so a
+# reload or failure mid-run resumes instead of duplicating work.
+WORKFLOW_JOURNAL_FILE = os.getenv("WORKFLOW_JOURNAL_FILE", "workflow_journal.jsonl")
+
+@lru_cache(maxsize=None)
+def get_journal_lock():
+    """Serializes appends across sessions sharing the process"""
+    return threading.Lock()
+
+def journal_record(step, scope, node, result=None):
+    """Append one completed side effect to the journal"""
+    entry = {"ts": time.time(), "step": step, "scope": scope, "node": node, "result": result or {}}
+    with get_journal_lock():
+        with open(WORKFLOW_JOURNAL_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+def journal_completed(step, scope):
+    """Node -> recorded result for everything `step` already did in `scope`"""
+    completed = {}
+    try:
+        with open(WORKFLOW_JOURNAL_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line from an interrupted write
+                if entry.get("step") == step and entry.get("scope") == scope:
+                    completed[entry["node"]] = entry.get("result", {})
+    except OSError:
+        pass
+    return completed
+
+def clear_workflow_journal():
+    if os.path.exists(WORKFLOW_JOURNAL_FILE):
+        os.remove(WORKFLOW_JOURNAL_FILE)
@@ -0,0 +1,186 @@
+"""Gemini calls behind an on-disk response cache"""
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+
+from .config import GEMINI_API_KEY
+from .resilience import get_service_guard
+
+# GEMINI RESPONSE CACHE
+# On-disk cache of Gemini answers keyed by model, prompt and generation config
+GEMINI_MODEL = "gemini-2.0-flash"
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", ".llm_cache")
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_MB", "200")) * 1024 * 1024
+LLM_CACHE_EVICT_TO = 0.9  # Evict down to this share of the limit so a full cache isn't rescanned on every write
+
+@lru_cache(maxsize=None)
+def get_gemini_module():
+    """google.generativeai, imported and configured on first use"""
+    import google.generativeai as genai
+
+    genai.configure(api_key=GEMINI_API_KEY)
+    return genai
+
+@lru_cache(maxsize=None)
+def get_llm_cache_state():
+    """Hit/miss counters, the bypass switch and the cache's running size, shared across reruns and worker threads"""
+    return {
+        "hits": 0,
+        "misses": 0,
+        "bypass": os.getenv("LLM_CACHE_DISABLED", "").lower() in ("1", "true", "yes"),
+        "lock": threading.Lock(),
+        "bytes": None,                  # Cache size in bytes; None until the first scan
+        "evict_lock": threading.Lock()  # Serializes size bookkeeping and eviction
+    }
+
+def llm_cache_key(model_name, prompt, generation_config=None):
+    """Content hash identifying one Gemini request"""
+    payload = json.dumps(
+        {"model": model_name, "prompt": prompt, "config": generation_config or {}},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def scan_llm_cache():
+    """(mtime, size, path) of every cached response; entries removed meanwhile are skipped"""
+    stats = []
+    try:
+        entries = list(os.scandir(LLM_CACHE_DIR))
+    except FileNotFoundError:
+        return stats
+    for entry in entries:
+        if not entry.name.endswith(".json"):
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        stats.append((stat.st_mtime, stat.st_size, entry.path))
+    return stats
+
+def evict_llm_cache():
+    """Delete least recently used entries until the cache is back under LLM_CACHE_EVICT_TO of its limit.
+
+    Call with the state's evict_lock held; returns the remaining size.
+    """
+    stats = scan_llm_cache()
+    total_size = sum(size for _, size, _ in stats)
+    for _, size, path in sorted(stats):
+        if total_size <= LLM_CACHE_MAX_BYTES * LLM_CACHE_EVICT_TO:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            continue
+        total_size -= size
+    return total_size
+
+def track_llm_cache_write(size_delta):
+    """Add a write to the running size and only scan the directory once it passes the limit"""
+    state = get_llm_cache_state()
+    with state["evict_lock"]:
+        if state["bytes"] is None:
+            state["bytes"] = sum(size for _, size, _ in scan_llm_cache())
+        else:
+            state["bytes"] += size_delta
+        if state["bytes"] > LLM_CACHE_MAX_BYTES:
+            state["bytes"] = evict_llm_cache()
+
+def clear_llm_cache():
+    """Remove every cached response and reset the counters"""
+    state = get_llm_cache_state()
+    try:
+        for entry in os.scandir(LLM_CACHE_DIR):
+            if entry.name.endswith(".json"):
+                os.remove(entry.path)
+    except FileNotFoundError:
+        pass
+    with state["lock"]:
+        state["hits"] = state["misses"] = 0
+    with state["evict_lock"]:
+        state["bytes"] = None
+
+def llm_cache_path(model_name, prompt, generation_config=None):
+    return os.path.join(LLM_CACHE_DIR, f"{llm_cache_key(model_name, prompt, generation_config)}.json")
+
+def read_llm_cache(cache_path):
+    """Cached response text for a request, or None; counts the hit or miss"""
+    state = get_llm_cache_state()
+    if not state["bypass"]:
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                text = json.load(f)["text"]
+            os.utime(cache_path)  # Mark as recently used for LRU eviction
+            with state["lock"]:
+                state["hits"] += 1
+            return text
+        except (OSError, ValueError, KeyError):
+            pass
+
+    with state["lock"]:
+        state["misses"] += 1
+    return None
+
+def write_llm_cache(cache_path, model_name, text):
+    """Store a response atomically and trim the cache back under its size limit.
+
+    Best effort: a failing cache must never lose a response already paid for.
+    """
+    if not text or not text.strip():
+        return
+    try:
+        os.makedirs(LLM_CACHE_DIR, exist_ok=True)
+        try:
+            old_size = os.path.getsize(cache_path)
+        except OSError:
+            old_size = 0
+        tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"model": model_name, "text": text}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+        track_llm_cache_write(os.path.getsize(cache_path) - old_size)
+    except OSError:
+        pass
+
+def generate_with_gemini(prompt, generation_config=None, model_name=GEMINI_MODEL, use_cache=True):
+    """Return Gemini's response text, served from the on-disk cache when possible.
+
+    Safe to call from worker threads. use_cache=False (or the global bypass
+    switch) forces a fresh call, which still refreshes the cached entry.
+    """
+    cache_path = llm_cache_path(model_name, prompt, generation_config)
+    if use_cache:
+        text = read_llm_cache(cache_path)
+        if text is not None:
+            return text
+
+    model = get_gemini_module().GenerativeModel(model_name)
+    response = get_service_guard("gemini").call(model.generate_content, prompt, generation_config=generation_config)
+    text = response.text
+    write_llm_cache(cache_path, model_name, text)
+    return text
+
+def stream_with_gemini(prompt, generation_config=None, model_name=GEMINI_MODEL):
+    """Yield Gemini's response text piece by piece, caching the full text at the end.
+
+    A cached response is yielded in one piece.
+    """
+    cache_path = llm_cache_path(model_name, prompt, generation_config)
+    text = read_llm_cache(cache_path)
+    if text is not None:
+        yield text
+        return
+
+    model = get_gemini_module().GenerativeModel(model_name)
+    pieces = []
+    response = get_service_guard("gemini").call(
+        model.generate_content, prompt, generation_config=generation_config, stream=True
+    )
+    for chunk in response:
+        pieces.append(chunk.text)
+        yield chunk.text
+    write_llm_cache(cache_path, model_name, "".join(pieces))
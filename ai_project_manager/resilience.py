@@ -0,0 +1,166 @@
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+
+import requests
+
+# RESILIENCE LAYER
+# Client-side throttling and retry/backoff shared by every Jira, GitHub and
+# Gemini call, so concurrent pipelines slow down together instead of dying
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "5"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))  # seconds
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "60"))  # seconds, give up rather than wait longer
+SERVICE_RATE_LIMITS = {  # requests per second
+    "jira": float(os.getenv("JIRA_RATE_LIMIT", "10")),
+    "github": float(os.getenv("GITHUB_RATE_LIMIT", "5")),
+    "gemini": float(os.getenv("GEMINI_RATE_LIMIT", "2"))
+}
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+class ServiceGuard:
+    """Token bucket plus retry policy for one external service.
+
+    The bucket refills at `rate` tokens per second. A rate-limit response
+    halves the rate and pauses every caller until the advised time, and each
+    success wins back 5% of the configured rate, so throughput settles at
+    what the service actually sustains.
+    """
+
+    def __init__(self, name, rate):
+        self.name = name
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(rate, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+        self.metrics = {"calls": 0, "retries": 0, "rate_limited": 0, "failures": 0, "throttled_seconds": 0.0}
+
+    def acquire(self):
+        """Block until a token is free and any rate-limit pause is over"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                delay = max(self.paused_until - now, 0.0)
+                if not delay:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        self.metrics["calls"] += 1
+                        return
+                    delay = (1 - self.tokens) / self.rate
+                self.metrics["throttled_seconds"] += delay
+            time.sleep(delay)
+
+    def record(self, key, amount=1):
+        with self.lock:
+            self.metrics[key] += amount
+
+    def record_success(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def record_rate_limit(self, delay):
+        with self.lock:
+            self.metrics["rate_limited"] += 1
+            self.rate = max(self.max_rate / 20, self.rate / 2)
+            self.paused_until = max(self.paused_until, time.monotonic() + delay)
+
+    def call(self, fn, *args, idempotent=True, **kwargs):
+        """Run fn(*args, **kwargs) through the throttle, retrying transient failures.
+
+        fn may return a response (status_code/headers) or raise an exception
+        carrying status/headers (PyGithub) or an HTTP code (Google API).
+        Non-idempotent calls are only retried on rate-limit responses, where
+        the service guarantees the request was not processed.
+        """
+        for attempt in range(RETRY_MAX_ATTEMPTS):
+            self.acquire()
+            result, error = None, None
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                error = e
+
+            status, headers = response_status(result, error)
+            rate_limited = is_rate_limited(status, headers)
+            transient = status in RETRYABLE_STATUSES or isinstance(error, (requests.ConnectionError, requests.Timeout))
+            delay = retry_after_seconds(headers, rate_limited)
+            if delay is None:
+                delay = backoff_delay(attempt)
+
+            last_attempt = attempt == RETRY_MAX_ATTEMPTS - 1 or delay > RETRY_MAX_DELAY
+            if not (rate_limited or (idempotent and transient)) or last_attempt:
+                if rate_limited or transient:
+                    self.record("failures")
+                elif error is None:
+                    self.record_success()
+                if error is not None:
+                    raise error
+                return result
+
+            self.record("retries")
+            if rate_limited:
+                self.record_rate_limit(delay)  # acquire() makes every caller wait it out
+            else:
+                time.sleep(delay)
+
+def response_status(result, error):
+    """(HTTP status, lower-cased headers) of a response or an API exception"""
+    if error is None and not isinstance(result, requests.Response):
+        return None, {}
+    source = result if error is None else error
+    status = getattr(source, "status_code", None) or getattr(source, "status", None)
+    if not isinstance(status, int):
+        code = getattr(source, "code", None)
+        status = code if isinstance(code, int) else None
+    headers = getattr(source, "headers", None) or {}
+    return status, {key.lower(): value for key, value in dict(headers).items()}
+
+def is_rate_limited(status, headers):
+    """429, or GitHub's 403 for primary/secondary rate limits"""
+    if status == 429:
+        return True
+    return status == 403 and ("retry-after" in headers or headers.get("x-ratelimit-remaining") == "0")
+
+def retry_after_seconds(headers, rate_limited=False):
+    """Seconds the service asked us to wait (Retry-After, or X-RateLimit-Reset when limited)"""
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                pass
+
+    reset = headers.get("x-ratelimit-reset")
+    if not reset or not rate_limited:
+        return None
+    try:
+        reset_at = float(reset)  # GitHub: epoch seconds
+    except ValueError:
+        try:
+            reset_at = datetime.fromisoformat(reset.replace("Z", "+00:00")).timestamp()  # Jira: ISO 8601
+        except ValueError:
+            return None
+    return max(reset_at - time.time(), 0.0)
+
+def backoff_delay(attempt):
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+@lru_cache(maxsize=None)
+def get_service_guards():
+    """One ServiceGuard per external service, shared by every session and worker thread"""
+    return {name: ServiceGuard(name, rate) for name, rate in SERVICE_RATE_LIMITS.items()}
+
+def get_service_guard(name):
+    return get_service_guards()[name]
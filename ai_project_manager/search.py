@@ -0,0 +1,138 @@
+"""In-memory full-text index over task titles and descriptions"""
+import re
+from bisect import bisect_left, insort
+
+TOKEN_PATTERN = re.compile(r"\w+")
+TITLE_WEIGHT = 3        # a title hit counts like three description hits
+PREFIX_FACTOR = 0.6     # "auth" -> "authentication"
+FUZZY_FACTOR = 0.4      # "authetication" -> "authentication" (one edit)
+FUZZY_MIN_LENGTH = 4    # shorter words match too much with one edit
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+def single_deletes(term):
+    return {term[:idx] + term[idx + 1:] for idx in range(len(term))}
+
+def within_one_edit(a, b):
+    """True if a and b differ by at most one insertion, deletion or substitution"""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    start = 0
+    while start < len(a) and a[start] == b[start]:
+        start += 1
+    if len(a) == len(b):
+        return a[start + 1:] == b[start + 1:]
+    return a[start:] == b[start + 1:]
+
+class TaskSearchIndex:
+    """Inverted index with ranked exact, prefix and one-edit fuzzy matching.
+
+    Postings map each word to the nodes containing it. A sorted vocabulary
+    serves prefix lookups, and every word is also filed under its
+    one-letter deletions, so a query word within one insertion, deletion
+    or substitution finds it without scanning the vocabulary. sync()
+    re-indexes only nodes whose text changed, so edits stay cheap.
+    """
+
+    def __init__(self):
+        self.postings = {}      # word -> {node_id: weight}
+        self.vocabulary = []    # sorted words, for prefix search
+        self.deletes = {}       # word or one-letter deletion of it -> {words}
+        self.documents = {}     # node_id -> ((title, description), {word: weight})
+        self.tree = None        # TaskTree last synced; a new tree restarts at version 0
+        self.version = None     # its version when synced
+
+    def add(self, node_id, title, description=""):
+        if node_id in self.documents:
+            self.remove(node_id)
+        weights = {}
+        for word in tokenize(title):
+            weights[word] = weights.get(word, 0) + TITLE_WEIGHT
+        for word in tokenize(description):
+            weights[word] = weights.get(word, 0) + 1
+        for word, weight in weights.items():
+            if word not in self.postings:
+                self.postings[word] = {}
+                insort(self.vocabulary, word)
+                if len(word) >= FUZZY_MIN_LENGTH:
+                    for variant in single_deletes(word) | {word}:
+                        self.deletes.setdefault(variant, set()).add(word)
+            self.postings[word][node_id] = weight
+        self.documents[node_id] = ((title, description), weights)
+
+    def remove(self, node_id):
+        _, weights = self.documents.pop(node_id, (None, {}))
+        for word in weights:
+            postings = self.postings[word]
+            del postings[node_id]
+            if postings:
+                continue
+            del self.postings[word]
+            del self.vocabulary[bisect_left(self.vocabulary, word)]
+            if len(word) >= FUZZY_MIN_LENGTH:
+                for variant in single_deletes(word) | {word}:
+                    self.deletes[variant].discard(word)
+                    if not self.deletes[variant]:
+                        del self.deletes[variant]
+
+    def sync(self, task_tree):
+        """Bring the index in line with a TaskTree, touching only added, edited or removed nodes"""
+        if self.tree is task_tree and self.version == task_tree.version:
+            return self
+        live = set()
+        for node in task_tree.nodes:
+            live.add(node.id)
+            indexed = self.documents.get(node.id)
+            if indexed is None or indexed[0] != (node.title, node.description):
+                self.add(node.id, node.title, node.description)
+        for node_id in [node_id for node_id in self.documents if node_id not in live]:
+            self.remove(node_id)
+        self.tree = task_tree
+        self.version = task_tree.version
+        return self
+
+    def matching_words(self, query_word):
+        """word -> match factor for every indexed word a query word matches"""
+        matches = {}
+        start = bisect_left(self.vocabulary, query_word)
+        for word in self.vocabulary[start:]:
+            if not word.startswith(query_word):
+                break
+            matches[word] = 1.0 if word == query_word else PREFIX_FACTOR
+        if len(query_word) >= FUZZY_MIN_LENGTH:
+            for variant in single_deletes(query_word) | {query_word}:
+                for word in self.deletes.get(variant, ()):
+                    # Two words sharing a deletion can be two edits apart ("abxd", "abdy")
+                    if word not in matches and within_one_edit(query_word, word):
+                        matches[word] = FUZZY_FACTOR
+        return matches
+
+    def search(self, query, limit=None, order=None):
+        """Node ids matching every query word, best first.
+
+        Each query word scores a node by its best matching word (exact,
+        prefix or fuzzy, times title/description weight); scores add up
+        across query words. Ties keep order(node_id) when given.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        scores = None
+        for query_word in words:
+            word_scores = {}
+            for word, factor in self.matching_words(query_word).items():
+                for node_id, weight in self.postings[word].items():
+                    score = factor * weight
+                    if score > word_scores.get(node_id, 0):
+                        word_scores[node_id] = score
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {node_id: score + word_scores[node_id] for node_id, score in scores.items() if node_id in word_scores}
+            if not scores:
+                return []
+        ranked = sorted(scores, key=lambda node_id: (-scores[node_id], order(node_id) if order else 0))
+        return ranked[:limit] if limit else ranked
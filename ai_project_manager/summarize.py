@@ -0,0 +1,468 @@
+"""Task extraction from document text with Gemini: single prompt, chunked
+map-reduce, streaming and incremental re-extraction of revised documents"""
+import copy
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .feedback import notify
+from .llm import generate_with_gemini, stream_with_gemini
+from .tasks import ensure_task_ids, walk_subtree
+
+def build_task_extraction_prompt(text):
+    """Prompt asking Gemini for the Epic/Task/Subtask JSON of a document (or part of one)"""
+    return f"""
+Document Task Extraction for Jira Issues
+
+Please analyze the provided document (PDF, DOCX, or TXT) and extract all tasks that should be created as Jira issues. Organize them hierarchically as follows:
+
+1. Identify main tasks/topics that will serve as "Epics" in Jira
+2. Identify secondary tasks that will be "Tasks" under their respective Epics
+3. Identify detailed work items that will be "Subtasks" under their respective Tasks
+4. If a subtask has its own subtasks, nest them in its "subtasks" list, as many levels deep as the document goes
+5. the description should be taken from the document
+6. keep the descriptions as short as possible but meaningful and concise which match in my document.
+7. make sure to don't miss-out and infromation from the document
+8. Do not include any sections related to Overview, Purpose, Scope, Tech stack suggestions, Time or hour estimates, Web design notes, Total days or effort summaries.
+Format the output as JSON with the following structure:
+{{
+  "tasks": [
+    {{
+      "title": "Main Task 1",
+      "description": "Take description of main task 1 from document",
+      "subtasks": [
+        {{
+          "title": "Subtask 1.1",
+          "description": "Take description of subtask 1.1 from document",
+          "subtasks": [
+            {{
+              "title": "Sub-subtask 1.1.1",
+              "description": "Take description of sub-subtask 1.1.1 from document"
+            }}
+          ]
+        }}
+      ]
+    }}
+  ]
+}}
+Important Guidelines:
+- don't add None, Select, and choose between  in description of tasks
+- if round brackets are used in the document then remove them from the description
+- if there are smimilar sub-tasks put them in under one related task 
+- if description is more than 200 characters then convert into subtasks
+- use only text from the document to fill in the JSON structure
+- Do not add any additional text or comments outside the JSON structure
+- don't include any explanations or summaries
+- don't use any extra text outside from the document
+- Stricly Don't use \n or \t in the title and description
+- Don't use any special characters in the title and description
+Given the following document content, remove any sections related to:
+- Overview Purpose Scope
+- Tech stack suggestions
+- Time or hour estimates
+- Web design notes
+- Total days or effort summaries
+Document Content:
+\"\"\"
+{text}
+\"\"\"
+"""
+
+def summarize_with_gemini(text):
+    try:
+        if len(text) > SUMMARY_CHUNK_CHARS:
+            return summarize_with_gemini_chunked(text)
+
+        prompt = build_task_extraction_prompt(text)
+        raw_output = generate_with_gemini(prompt, generation_config={"temperature": 0.1}).strip()
+
+        match = re.search(r"\{[\s\S]*\}", raw_output)
+        if match:
+            return match.group(0)
+        else:
+            notify("warning", "No JSON block found in Gemini response.")
+            return raw_output  # fallback
+    except Exception as e:
+        notify("error", f"Gemini API error: {e}")
+        return None
+
+# NEW FUNCTIONALITY 9: CHUNKED SUMMARIZATION FOR LARGE DOCUMENTS
+SUMMARY_CHUNK_CHARS = int(os.getenv("SUMMARY_CHUNK_CHARS", "30000"))
+SUMMARY_CHUNK_OVERLAP = int(os.getenv("SUMMARY_CHUNK_OVERLAP", "1000"))
+SUMMARY_MAX_WORKERS = int(os.getenv("SUMMARY_MAX_WORKERS", "4"))
+
+# Markdown headings, numbered headings ("2.1 Venue Management") and short ALL CAPS lines
+HEADING_PATTERN = re.compile(r"^(#{1,6}\s+\S|\d+(\.\d+)*\.?\s+[A-Z]|[A-Z][A-Z0-9 &/,\-]{3,80}$)")
+
+def split_document_sections(text):
+    """Split text into sections at page breaks (form feeds) and heading-like lines.
+
+    Also accepts an iterable of page texts, such as iter_pdf_pages().
+    """
+    pages = text.split("\f") if isinstance(text, str) else text
+    sections = []
+    for page in pages:
+        current = []
+        for line in page.split("\n"):
+            if current and HEADING_PATTERN.match(line.strip()):
+                sections.append("\n".join(current))
+                current = []
+            current.append(line)
+        sections.append("\n".join(current))
+    return [section for section in sections if section.strip()]
+
+def chunk_document(text, max_chars=None, overlap=None):
+    """Pack document sections into chunks of at most max_chars, each prefixed with
+    the tail of the previous chunk so tasks spanning a boundary aren't lost"""
+    max_chars = max_chars or SUMMARY_CHUNK_CHARS
+    overlap = SUMMARY_CHUNK_OVERLAP if overlap is None else overlap
+
+    pieces = []
+    for section in split_document_sections(text):
+        # A single oversized section is cut on line boundaries where possible
+        while len(section) > max_chars:
+            cut = section.rfind("\n", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            pieces.append(section[:cut])
+            section = section[cut:]
+        pieces.append(section)
+
+    chunks, current = [], ""
+    for piece in pieces:
+        if current and len(current) + len(piece) + 1 > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}\n{piece}" if current else piece
+    if current.strip():
+        chunks.append(current)
+
+    if overlap <= 0 or len(chunks) < 2:
+        return chunks
+    return [chunks[0]] + [f"{previous[-overlap:]}\n{chunk}" for previous, chunk in zip(chunks, chunks[1:])]
+
+def summarize_chunk(chunk):
+    """Extract the task list from one chunk; worker-safe, raises on bad output"""
+    raw_output = generate_with_gemini(
+        build_task_extraction_prompt(chunk),
+        generation_config={"temperature": 0.1}
+    )
+    match = re.search(r"\{[\s\S]*\}", raw_output)
+    if not match:
+        raise ValueError("No JSON block found in Gemini response")
+    return json.loads(match.group(0)).get("tasks", [])
+
+def normalize_task_title(title):
+    return re.sub(r"\W+", " ", title).strip().lower()
+
+def merge_task_lists(task_lists):
+    """Merge task lists from several chunks, de-duplicating by title at every level"""
+    merged = []
+    # (destination, lists to merge into it); child levels are queued instead of recursing
+    pending = [(merged, task_lists)]
+    while pending:
+        destination, lists = pending.pop()
+        by_title, child_lists = {}, {}
+        for tasks in lists:
+            for task in tasks:
+                if not isinstance(task, dict) or not task.get("title"):
+                    continue
+                key = normalize_task_title(task["title"])
+                existing = by_title.get(key)
+                # Gemini sometimes sends "description": null
+                description = task.get("description") or ""
+                if existing is None:
+                    existing = {"title": task["title"], "description": description}
+                    by_title[key] = existing
+                    destination.append(existing)
+                elif len(description) > len(existing["description"]):
+                    # Overlapping chunks can cut a description short, keep the fuller one
+                    existing["description"] = description
+
+                if task.get("subtasks"):
+                    child_lists.setdefault(key, []).append(task["subtasks"])
+        for key, subtask_lists in child_lists.items():
+            by_title[key]["subtasks"] = []
+            pending.append((by_title[key]["subtasks"], subtask_lists))
+    return merged
+
+def summarize_with_gemini_chunked(text):
+    """Map-reduce summarization: extract tasks from every chunk in parallel, then merge"""
+    chunks = chunk_document(text)
+    task_lists = [[] for _ in chunks]
+
+    with ThreadPoolExecutor(max_workers=SUMMARY_MAX_WORKERS) as executor:
+        futures = {executor.submit(summarize_chunk, chunk): idx for idx, chunk in enumerate(chunks)}
+        for future in futures:
+            idx = futures[future]
+            try:
+                task_lists[idx] = future.result()
+            except Exception as e:
+                notify("warning", f"⚠️ Could not extract tasks from part {idx + 1} of {len(chunks)}: {e}")
+
+    if not any(task_lists):
+        notify("error", "Gemini API error: no tasks could be extracted from any part of the document.")
+        return None
+    # Merge in document order so Epics keep the order they appear in
+    return json.dumps({"tasks": merge_task_lists(task_lists)}, indent=2, ensure_ascii=False)
+
+# NEW FUNCTIONALITY 10: STREAMING SUMMARIZATION
+class IncrementalTaskParser:
+    """Pull complete Epics out of a streamed {"tasks": [...]} response as soon as they close.
+
+    Tracks string/escape state and bracket depth across feed() calls, so
+    each top-level object in the tasks array is parsed exactly once.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.in_array = False
+        self.finished = False
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.start = None
+
+    def feed(self, text):
+        """Add streamed text and return the list of Epics completed by it"""
+        self.buffer += text
+        tasks = []
+        if self.finished:
+            return tasks
+        if not self.in_array:
+            match = re.search(r'"tasks"\s*:\s*\[', self.buffer)
+            if not match:
+                return tasks
+            self.in_array = True
+            self.pos = match.end()
+
+        while self.pos < len(self.buffer):
+            ch = self.buffer[self.pos]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch in "{[":
+                if self.depth == 0 and ch == "{":
+                    self.start = self.pos
+                self.depth += 1
+            elif ch in "}]":
+                self.depth -= 1
+                if self.depth < 0:
+                    self.finished = True  # End of the tasks array
+                    break
+                if self.depth == 0 and self.start is not None:
+                    try:
+                        tasks.append(json.loads(self.buffer[self.start:self.pos + 1]))
+                    except json.JSONDecodeError:
+                        pass
+                    self.start = None
+            self.pos += 1
+
+        if self.start is None:
+            # Nothing open, so the consumed prefix is no longer needed
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        return tasks
+
+def stream_summarize_with_gemini(text):
+    """Yield the growing task list while Gemini is still answering.
+
+    Small documents are streamed and every Epic is yielded as soon as its
+    JSON closes. Large documents yield the merged list each time another
+    chunk finishes. The last value yielded is the complete task list;
+    raises ValueError if the response ends before the task list closes
+    (or no chunk yields tasks), so callers never mistake a truncated
+    list for a finished one.
+    """
+    if len(text) > SUMMARY_CHUNK_CHARS:
+        chunks = chunk_document(text)
+        task_lists = [[] for _ in chunks]
+        with ThreadPoolExecutor(max_workers=SUMMARY_MAX_WORKERS) as executor:
+            futures = {executor.submit(summarize_chunk, chunk): idx for idx, chunk in enumerate(chunks)}
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx = futures[future]
+                    try:
+                        task_lists[idx] = future.result()
+                    except Exception as e:
+                        notify("warning", f"⚠️ Could not extract tasks from part {idx + 1} of {len(chunks)}: {e}")
+                yield merge_task_lists(task_lists)
+        if not any(task_lists):
+            raise ValueError("no tasks could be extracted from any part of the document")
+        return
+
+    parser = IncrementalTaskParser()
+    tasks = []
+    for piece in stream_with_gemini(build_task_extraction_prompt(text), generation_config={"temperature": 0.1}):
+        new_tasks = parser.feed(piece)
+        if new_tasks:
+            tasks.extend(task for task in new_tasks if isinstance(task, dict) and task.get("title"))
+            yield list(tasks)
+    if not parser.finished:
+        raise ValueError("the response ended before the task list was complete")
+    if not tasks:
+        yield tasks
+
+# NEW FUNCTIONALITY 12: INCREMENTAL RE-EXTRACTION OF REVISED DOCUMENTS
+SECTIONS_STATE_FILE = "geminisummary.sections.json"
+SECTION_SEGMENT_CHARS = int(os.getenv("SECTION_SEGMENT_CHARS", "8000"))
+
+def section_hash(section):
+    """Whitespace-insensitive fingerprint of a document section"""
+    return hashlib.sha256(" ".join(section.split()).encode("utf-8")).hexdigest()[:16]
+
+def load_sections_state():
+    """Section hashes and task provenance saved with the last extraction, or None"""
+    try:
+        with open(SECTIONS_STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def save_sections_state(state):
+    if state is None:
+        if os.path.exists(SECTIONS_STATE_FILE):
+            os.remove(SECTIONS_STATE_FILE)
+        return
+    with open(SECTIONS_STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+
+def initial_sections_state(text):
+    """Sections state after a full extraction.
+
+    A full extraction doesn't say which section produced which task, so its
+    tasks get no provenance: later incremental updates merge into them but
+    never remove them, that is left to the user.
+    """
+    return {"sections": [section_hash(section) for section in split_document_sections(text)], "sources": {}}
+
+def group_changed_sections(sections, max_chars=None):
+    """Group runs of consecutive (hash, text) sections into prompt-sized segments"""
+    max_chars = max_chars or SECTION_SEGMENT_CHARS
+    segments, current, size, last_idx = [], [], 0, None
+    for idx, section_hash_value, section in sections:
+        adjacent = last_idx is not None and idx == last_idx + 1
+        if current and (not adjacent or size + len(section) > max_chars):
+            segments.append(current)
+            current, size = [], 0
+        current.append((section_hash_value, section))
+        size += len(section)
+        last_idx = idx
+    if current:
+        segments.append(current)
+    return segments
+
+def merge_revised_tasks(existing, extracted, changes):
+    """Merge freshly extracted nodes into existing siblings by title.
+
+    Matching nodes keep their id (and any edits to fields the document
+    didn't change); new nodes are appended. Ids are recorded in
+    changes["added"] / changes["changed"]. Returns the top-level nodes touched.
+    """
+    touched = []
+    pending = [(existing, extracted, True)]
+    while pending:
+        siblings, revised, top_level = pending.pop()
+        by_title = {normalize_task_title(task["title"]): task for task in siblings}
+        for task in revised:
+            if not isinstance(task, dict) or not task.get("title"):
+                continue
+            key = normalize_task_title(task["title"])
+            match = by_title.get(key)
+            if match is None:
+                match = ensure_task_ids([merge_task_lists([[task]])[0]])[0]
+                siblings.append(match)
+                by_title[key] = match
+                for _, node, _ in walk_subtree(match):
+                    changes["added"].add(node["id"])
+            else:
+                description = task.get("description") or ""
+                if description and description != match.get("description"):
+                    match["description"] = description
+                    changes["changed"].add(match["id"])
+                if task.get("subtasks"):
+                    pending.append((match.setdefault("subtasks", []), task["subtasks"], False))
+            if top_level:
+                touched.append(match)
+    return touched
+
+def summarize_incrementally(text, existing_tasks, previous_state=None):
+    """Re-extract only the sections of a revised document that changed.
+
+    The document is split into sections and each is hashed. Runs of new or
+    edited sections are sent to Gemini in parallel and their tasks merged
+    into a copy of the existing tree by title, so edits elsewhere survive.
+    Provenance is tracked per prompt segment for the top-level tasks
+    extracted here, and such a task is removed once none of the sections it
+    was extracted from remain. Tasks without provenance (from a full
+    extraction or added by hand) are never removed.
+    Returns (tasks, state, changes), or None if any segment failed.
+    """
+    sections = split_document_sections(text)
+    hashes = [section_hash(section) for section in sections]
+    current_hashes = set(hashes)
+    previous_state = previous_state or {"sections": [], "sources": {}}
+    previous_hashes = set(previous_state["sections"])
+
+    tasks = ensure_task_ids(copy.deepcopy(existing_tasks))
+    sources = {task_id: set(hashes_) for task_id, hashes_ in previous_state["sources"].items()}
+    changes = {"added": set(), "changed": set(), "removed": []}
+
+    changed_sections = [
+        (idx, hash_value, section)
+        for idx, (hash_value, section) in enumerate(zip(hashes, sections))
+        if hash_value not in previous_hashes
+    ]
+    segments = group_changed_sections(changed_sections)
+
+    with ThreadPoolExecutor(max_workers=SUMMARY_MAX_WORKERS) as executor:
+        futures = [
+            executor.submit(summarize_chunk, "\n".join(section for _, section in segment))
+            for segment in segments
+        ]
+        results = []
+        for idx, future in enumerate(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                notify("error", f"❌ Could not extract tasks from changed part {idx + 1} of {len(segments)}: {e}")
+                return None
+
+    touched_ids = set()
+    for segment, extracted in zip(segments, results):
+        segment_hashes = {hash_value for hash_value, _ in segment}
+        for task in merge_revised_tasks(tasks, extracted, changes):
+            # Only nodes this run added or already traced to sections get provenance;
+            # a title match alone doesn't tell where else an older task came from
+            if task["id"] in sources or task["id"] in changes["added"]:
+                sources.setdefault(task["id"], set()).update(segment_hashes)
+            touched_ids.add(task["id"])
+
+    kept = []
+    for task in tasks:
+        if task["id"] in sources:
+            sources[task["id"]] &= current_hashes
+            # Tasks without provenance are never dropped
+            if not sources[task["id"]] and task["id"] not in touched_ids:
+                changes["removed"].append(task["title"])
+                del sources[task["id"]]
+                continue
+        kept.append(task)
+
+    state = {
+        "sections": hashes,
+        "sources": {task["id"]: sorted(sources[task["id"]]) for task in kept if task["id"] in sources}
+    }
+    return kept, state, changes
@@ -0,0 +1,274 @@
+"""Task tree helpers shared by extraction, Jira sync and the UI"""
+import hashlib
+import json
+import uuid
+from itertools import islice
+
+TASKS_FILE = "geminisummary.json"
+
+def new_task_id():
+    return uuid.uuid4().hex[:12]
+
+def derived_task_id(namespace, path, title):
+    """Id that is the same every time a document yields the same node at the same place"""
+    content = json.dumps([namespace, list(path), title], ensure_ascii=False)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+
+def ensure_task_ids(tasks, namespace=None):
+    """Give every node a stable "id" (stored in TASKS_FILE) if it has none.
+
+    Without a namespace new ids are random. With one (e.g. the source
+    document) they are derived from it, the outline path and the title, so
+    re-extracting the same document yields the same ids and the workflow
+    journal recognises its nodes.
+    """
+    for path, task, _ in walk_tasks(tasks):
+        if not task.get("id"):
+            task["id"] = derived_task_id(namespace, path, task.get("title", "")) if namespace else new_task_id()
+    return tasks
+
+# NEW FUNCTIONALITY 17: GENERIC TASK TRAVERSAL
+# Every stage walks nested task dicts through these helpers instead of
+# hard-coding Epic -> Task -> Subtask loops, so deeper levels are not dropped.
+def task_subtasks(task):
+    return task.get("subtasks") or []
+
+def walk_subtree(task, path=(1,), parent=None, children=task_subtasks):
+    """Yield (path, task, parent) for task and everything below it in pre-order.
+
+    Iterative, so depth is only limited by memory. path is the 1-based
+    outline position, e.g. (1, 2, 3) for T1.2.3. children(task) lists a
+    node's children: "subtasks" of task dicts by default, TaskTree passes
+    one for its TaskNodes.
+    """
+    stack = [(path, task, parent)]
+    while stack:
+        path, task, parent = stack.pop()
+        yield path, task, parent
+        stack.extend((path + (idx + 1,), child, task) for idx, child in reversed(list(enumerate(children(task)))))
+
+def walk_tasks(tasks, children=task_subtasks):
+    """Yield (path, task, parent) for every node of a task list in pre-order"""
+    for idx, task in enumerate(tasks):
+        yield from walk_subtree(task, (idx + 1,), children=children)
+
+def visit_subtrees(tasks, visitor):
+    """Call visitor(path, task, parent) on every node and return the results in pre-order.
+
+    Visitors run on the calling thread. Every visitor in the app is cheap, pure
+    Python (names, tickets, ids), so threads would only add GIL contention; the
+    per-node network work runs on the stages' own bounded pools instead
+    (create_jira_issues_concurrent, sync_jira_issues, run_test_case_pipeline).
+    """
+    return [visitor(path, task, parent) for path, task, parent in walk_tasks(tasks)]
+
+def count_tasks(tasks_data, children=task_subtasks):
+    """Number of nodes at each level, top level first (main tasks, subtasks, ...)"""
+    counts = []
+    for path, _, _ in walk_tasks(tasks_data, children):
+        if len(path) > len(counts):
+            counts.append(0)
+        counts[len(path) - 1] += 1
+    return tuple(counts)
+
+def save_tasks(tasks_data, tree_id=None, path=TASKS_FILE):
+    """Write the task tree to TASKS_FILE, giving new nodes (and a new tree) an id first.
+
+    tree_id names this tree across saves, so state kept per tree (such as
+    the Jira sync map) is never applied to a different extraction.
+    """
+    ensure_task_ids(tasks_data)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"tree_id": tree_id or new_task_id(), "tasks": tasks_data}, f, indent=2, ensure_ascii=False)
+
+def read_tasks_file(path=TASKS_FILE):
+    """(tasks, tree_id) from a tasks file, saving ids assigned to older files"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    tasks_data = data.get("tasks", [])
+    tree_id = data.get("tree_id")
+    original = json.dumps(tasks_data)
+    ensure_task_ids(tasks_data)
+    if not tree_id or json.dumps(tasks_data) != original:
+        tree_id = tree_id or new_task_id()
+        save_tasks(tasks_data, tree_id, path)
+    return tasks_data, tree_id
+
+def load_saved_tasks():
+    """Load tasks from TASKS_FILE, saving ids assigned to older files"""
+    return read_tasks_file()[0]
+
+# NEW FUNCTIONALITY 16: INDEXED TASK TREE
+class TaskNode:
+    """One task; `extra` keeps any keys besides title, description, subtasks and id"""
+    __slots__ = ("id", "title", "description", "parent", "children", "depth", "path", "extra")
+
+    def __init__(self, node_id, title, description="", parent=None, extra=None):
+        self.id = node_id
+        self.title = title
+        self.description = description
+        self.parent = parent
+        self.children = []
+        self.depth = 0
+        self.path = ()
+        self.extra = extra or {}
+
+    @property
+    def label(self):
+        """Outline number such as T1.2.3"""
+        return "T" + ".".join(str(position) for position in self.path)
+
+    def to_dict(self):
+        """This node alone in the geminisummary.json shape, without subtasks"""
+        task = {"title": self.title, "description": self.description}
+        task.update(self.extra)
+        task["id"] = self.id
+        return task
+
+    def __repr__(self):
+        return f"TaskNode({self.label} {self.title!r})"
+
+def node_children(node):
+    return node.children
+
+class TaskTree:
+    """Task hierarchy of any depth with O(1) lookup by id or outline path.
+
+    `nodes` is the flat pre-order list of every node. It, the id/path
+    indexes and each node's depth and path are rebuilt once per structural
+    change (add/remove) and per-level counts are cached, so walks, lookups
+    and counts of an unchanged tree cost nothing. `version` goes up on
+    every change and can key derived caches. `tree_id` survives edits and
+    saves but is new for every fresh extraction.
+    """
+
+    def __init__(self, tasks=None, tree_id=None):
+        self.tree_id = tree_id or new_task_id()
+        self.roots = []
+        self.version = 0
+        self.nodes = []
+        self._by_id = {}
+        self._by_path = {}
+        self._counts = None
+        if tasks:
+            self._attach_dicts(tasks, None)
+
+    @classmethod
+    def load(cls, path=TASKS_FILE):
+        """Tree from a geminisummary.json file, keeping its tree id"""
+        return cls(*read_tasks_file(path))
+
+    def save(self, path=TASKS_FILE):
+        save_tasks(self.to_dicts(), self.tree_id, path)
+
+    def _attach_dicts(self, tasks, parent):
+        """Create nodes for nested task dicts under parent; returns the new top nodes"""
+        top = []
+        created = {}  # id() of a task dict -> its node
+        for _, task, parent_task in walk_tasks(tasks):
+            owner = created[id(parent_task)] if parent_task is not None else parent
+            extra = {key: value for key, value in task.items() if key not in ("id", "title", "description", "subtasks")}
+            node = TaskNode(task.get("id") or new_task_id(), task.get("title") or "", task.get("description") or "", owner, extra)
+            created[id(task)] = node
+            if owner is None:
+                self.roots.append(node)
+            else:
+                owner.children.append(node)
+            if parent_task is None:
+                top.append(node)
+        self._changed(structure=True)
+        return top
+
+    def to_dicts(self):
+        """Nested task dicts in the geminisummary.json shape; "subtasks" only where there are children"""
+        converted = {}
+        tasks = []
+        for node in self.nodes:
+            task = converted[node.id] = node.to_dict()
+            if node.parent is None:
+                tasks.append(task)
+            else:
+                converted[node.parent.id].setdefault("subtasks", []).append(task)
+        return tasks
+
+    def _changed(self, structure=False):
+        self.version += 1
+        if structure:
+            self._reindex()
+            self._counts = None
+
+    def _reindex(self):
+        nodes, by_id, by_path = [], {}, {}
+        for path, node, _ in walk_tasks(self.roots, node_children):
+            node.path = path
+            node.depth = len(path) - 1
+            nodes.append(node)
+            by_id[node.id] = node
+            by_path[path] = node
+        self.nodes, self._by_id, self._by_path = nodes, by_id, by_path
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def __contains__(self, node_id):
+        return self.get(node_id) is not None
+
+    def get(self, node_id):
+        return self._by_id.get(node_id)
+
+    def get_by_path(self, path):
+        """Node at a 1-based outline path such as (1, 2, 3)"""
+        return self._by_path.get(tuple(path))
+
+    def counts(self):
+        """Number of nodes at each depth, top level first"""
+        if self._counts is None:
+            self._counts = count_tasks(self.roots, node_children)
+        return self._counts
+
+    def add(self, title, description="", parent_id=None, index=None):
+        """Add a leaf under parent_id (top level when None) and return it"""
+        parent = self.get(parent_id) if parent_id else None
+        if parent_id and parent is None:
+            raise KeyError(parent_id)
+        siblings = parent.children if parent else self.roots
+        node = TaskNode(new_task_id(), title, description, parent)
+        siblings.insert(len(siblings) if index is None else index, node)
+        self._changed(structure=True)
+        return node
+
+    def add_dicts(self, tasks, parent_id=None):
+        """Add nested task dicts (e.g. fresh Gemini output) under parent_id; returns the new top nodes"""
+        parent = self.get(parent_id) if parent_id else None
+        if parent_id and parent is None:
+            raise KeyError(parent_id)
+        return self._attach_dicts(tasks, parent)
+
+    def descendants(self, node):
+        """Every node below node, in pre-order"""
+        for _, child, _ in islice(walk_subtree(node, children=node_children), 1, None):
+            yield child
+
+    def update(self, node_id, title=None, description=None):
+        node = self.get(node_id)
+        if node is None:
+            raise KeyError(node_id)
+        if title is not None:
+            node.title = title
+        if description is not None:
+            node.description = description
+        self._changed()
+        return node
+
+    def remove(self, node_id):
+        """Detach a node with its whole subtree and return it"""
+        node = self.get(node_id)
+        if node is None:
+            raise KeyError(node_id)
+        (node.parent.children if node.parent else self.roots).remove(node)
+        node.parent = None
+        self._changed(structure=True)
+        return node
@@ -0,0 +1,338 @@
+"""Test case generation with Gemini and the generate -> push -> comment pipeline"""
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .config import JIRA_BASE_URL
+from .feedback import notify
+from .github_api import feature_branch_name, push_files_to_branch
+from .jira import add_comment_to_jira_issue, task_content_hash
+from .journal import journal_record, journal_completed
+from .llm import generate_with_gemini
+from .tasks import visit_subtrees
+
+def generate_test_case_prompt(ticket):
+    """Generate a prompt for test case generation"""
+    return f"""
+You are a senior QA engineer. Based on the following task, write two detailed test cases including:
+- A title
+- Description
+- Steps
+- Expected Result
+- Priority
+
+Task:
+Title: {ticket['summary']}
+Description: {ticket['description']}
+"""
+
+def generate_batched_test_case_prompt(tickets):
+    """Generate one prompt covering several tickets, answered as JSON keyed by ticket key"""
+    task_blocks = "\n".join(
+        f"""
+Task key: {ticket['key']}
+Title: {ticket['summary']}
+Description: {ticket['description']}
+"""
+        for ticket in tickets
+    )
+    return f"""
+You are a senior QA engineer. For each task below, write two detailed test cases including:
+- A title
+- Description
+- Steps
+- Expected Result
+- Priority
+
+Return only a JSON object. Use every task key exactly as given as a property name and
+put that task's test cases, formatted as Markdown, in a single string value.
+
+Tasks:
+{task_blocks}
+"""
+
+def save_test_case_file(ticket, ai_output, output_dir="test_cases"):
+    """Wrap the AI output with the ticket header and save it locally"""
+    os.makedirs(output_dir, exist_ok=True)
+    file_path = os.path.join(output_dir, f"{ticket['key']}_test_cases.md")
+
+    test_case_content = f"# Test Cases for {ticket['key']} - {ticket['summary']}\n\n{ai_output}"
+    
+    # Save locally
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(test_case_content)
+    return test_case_content
+
+def build_test_case_file(ticket, output_dir="test_cases"):
+    """Generate test case markdown for a ticket with AI and save it locally.
+
+    Raises on failure and never touches Streamlit, so it can run on a worker thread.
+    """
+    prompt = generate_test_case_prompt(ticket)
+    ai_output = generate_with_gemini(prompt)
+    return save_test_case_file(ticket, ai_output.strip(), output_dir)
+
+# NEW FUNCTIONALITY 8: BATCHED TEST CASE PROMPTS
+GEMINI_TEST_BATCH_SIZE = int(os.getenv("GEMINI_TEST_BATCH_SIZE", "5"))
+GEMINI_TEST_BATCH_RETRIES = 1
+
+def parse_batched_test_cases(raw_output, tickets):
+    """Split a batched response into {ticket key: markdown}, skipping missing or malformed entries"""
+    match = re.search(r"\{[\s\S]*\}", raw_output)
+    if not match:
+        return {}
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    parsed = {}
+    for ticket in tickets:
+        value = data.get(ticket["key"])
+        if isinstance(value, str) and value.strip():
+            parsed[ticket["key"]] = value.strip()
+    return parsed
+
+def build_test_case_files(tickets, output_dir="test_cases"):
+    """Generate and save test cases for several tickets with one Gemini prompt.
+
+    Tickets missing from the answer, or with a malformed entry, are re-asked
+    as a smaller batch, and anything still missing falls back to its own
+    prompt. Returns ({ticket key: content}, {ticket key: exception}).
+    Worker-safe like build_test_case_file.
+    """
+    contents, errors = {}, {}
+    remaining = list(tickets)
+
+    if len(remaining) > 1:
+        for attempt in range(GEMINI_TEST_BATCH_RETRIES + 1):
+            try:
+                raw_output = generate_with_gemini(
+                    generate_batched_test_case_prompt(remaining),
+                    generation_config={"response_mime_type": "application/json"},
+                    use_cache=attempt == 0  # A retry of the same prompt must not replay a bad cached answer
+                )
+                parsed = parse_batched_test_cases(raw_output, remaining)
+            except Exception:
+                parsed = {}
+
+            for ticket in remaining:
+                if ticket["key"] in parsed:
+                    contents[ticket["key"]] = save_test_case_file(ticket, parsed[ticket["key"]], output_dir)
+            remaining = [ticket for ticket in remaining if ticket["key"] not in contents]
+            if len(remaining) <= 1:
+                break
+
+    for ticket in remaining:
+        try:
+            contents[ticket["key"]] = build_test_case_file(ticket, output_dir)
+        except Exception as e:
+            errors[ticket["key"]] = e
+    return contents, errors
+
+def report_test_case_error(ticket, error, output_dir="test_cases"):
+    """Show a generation failure and leave an error log next to the test cases"""
+    notify("error", f"❌ Error generating test cases for {ticket['key']}: {error}")
+    os.makedirs(output_dir, exist_ok=True)
+    fallback_path = os.path.join(output_dir, f"{ticket['key']}_error.log")
+    with open(fallback_path, "w", encoding="utf-8") as f:
+        f.write(f"# Critical error while processing {ticket['key']}\nError: {str(error)}")
+
+def collect_test_case_tickets(tasks, parent_key="T", jira_keys=None, branch_namespace=None):
+    """Tickets for every node at any depth with the branch their tests go to.
+
+    jira_keys maps titles to issue keys; branch_namespace is passed on to
+    feature_branch_name.
+    """
+    jira_keys = jira_keys or {}
+
+    def ticket(path, task, parent):
+        return {
+            "key": parent_key + ".".join(str(position) for position in path),
+            "id": task.get("id"),
+            "summary": task.get("title", ""),
+            "description": task.get("description") or "",
+            "jira_key": jira_keys.get(task.get("title", "")),
+            "branch_name": feature_branch_name(path, task["title"], branch_namespace)
+        }
+
+    return visit_subtrees(tasks, ticket)
+
+# NEW FUNCTIONALITY 7: PIPELINED TEST CASE GENERATION
+TEST_LLM_WORKERS = int(os.getenv("TEST_LLM_WORKERS", "4"))
+TEST_GITHUB_WORKERS = int(os.getenv("TEST_GITHUB_WORKERS", "4"))
+TEST_JIRA_WORKERS = int(os.getenv("TEST_JIRA_WORKERS", "4"))
+
+def run_test_case_pipeline(tickets, repo_name=None, single_branch=None, output_dir="test_cases",
+                           llm_workers=None, github_workers=None, jira_workers=None,
+                           batch_size=None, progress_callback=None):
+    """Generate, push and comment test cases through three bounded worker pools.
+
+    LLM workers produce the markdown for batch_size tickets per prompt
+    (GEMINI_TEST_BATCH_SIZE by default); each finished ticket is handed to the
+    Jira pool for its comment, and a branch is handed to the GitHub pool as
+    soon as all of its tickets are generated, so it gets a single commit.
+    Generations, pushes and comments already in the workflow journal for
+    the same node and title/description are skipped, reusing the saved file
+    instead of prompting again.
+    Streamlit output and progress happen on the calling thread only.
+    progress_callback receives (fraction, text). "failed" counts tickets
+    without test cases; "push_failed" (branches) and "comment_failed"
+    (issues) count the later steps that did not go through.
+    """
+    summary = {
+        "generated": 0, "pushed": 0, "commented": 0, "failed": 0, "skipped": 0,
+        "push_failed": 0, "comment_failed": 0
+    }
+    generated = journal_completed("test_generate", output_dir)
+    pushed = journal_completed("test_push", repo_name) if repo_name else {}
+    commented = journal_completed("test_comment", JIRA_BASE_URL)
+
+    def journal_node(ticket):
+        # The content hash makes an edited task generate, push and comment again
+        content_hash = task_content_hash({"title": ticket["summary"], "description": ticket["description"]})
+        return f"{ticket.get('id') or ticket['key']}:{content_hash}"
+
+    def comment_node(ticket):
+        return f"{ticket['jira_key']}:{journal_node(ticket)}"
+
+    def push_node(ticket):
+        return f"{single_branch or ticket['branch_name']}:{journal_node(ticket)}"
+
+    saved_contents = {}
+    pending_tickets = []
+    for ticket in tickets:
+        ticket = dict(
+            ticket,
+            needs_push=bool(repo_name) and push_node(ticket) not in pushed,
+            needs_comment=bool(ticket.get("jira_key")) and comment_node(ticket) not in commented
+        )
+        saved = generated.get(journal_node(ticket))
+        if saved and os.path.exists(saved["path"]):
+            with open(saved["path"], "r", encoding="utf-8") as f:
+                saved_contents[ticket["key"]] = f.read()
+        if ticket["key"] in saved_contents and not ticket["needs_push"] and not ticket["needs_comment"]:
+            summary["skipped"] += 1
+            continue
+        pending_tickets.append(ticket)
+    tickets = pending_tickets
+
+    files_by_branch = {}
+    tickets_by_branch = {}
+    remaining_by_branch = {}
+    for ticket in tickets:
+        branch_name = single_branch or ticket["branch_name"]
+        remaining_by_branch[branch_name] = remaining_by_branch.get(branch_name, 0) + 1
+
+    total_steps = len(tickets)
+    total_steps += sum(1 for ticket in tickets if ticket["needs_comment"])
+    total_steps += len(remaining_by_branch) if repo_name else 0
+    done_steps = 0
+
+    with ThreadPoolExecutor(max_workers=llm_workers or TEST_LLM_WORKERS) as llm_pool, \
+            ThreadPoolExecutor(max_workers=github_workers or TEST_GITHUB_WORKERS) as github_pool, \
+            ThreadPoolExecutor(max_workers=jira_workers or TEST_JIRA_WORKERS) as jira_pool:
+        pending = {}
+
+        def finish_branch_ticket(branch_name):
+            nonlocal total_steps
+            remaining_by_branch[branch_name] -= 1
+            if remaining_by_branch[branch_name] or not repo_name:
+                return
+            if not files_by_branch.get(branch_name):
+                total_steps -= 1  # Every ticket for this branch failed or was pushed already
+                return
+            future = github_pool.submit(
+                push_files_to_branch,
+                repo_name,
+                branch_name,
+                files_by_branch.pop(branch_name),
+                f"Add test cases for {branch_name}",
+                bool(single_branch)
+            )
+            pending[future] = ("github", branch_name)
+
+        def accept_test_cases(ticket, test_case_content):
+            branch_name = single_branch or ticket["branch_name"]
+            if ticket["needs_push"]:
+                github_path = f"test_cases/{ticket['key']}_test_cases.md"
+                files_by_branch.setdefault(branch_name, {})[github_path] = test_case_content
+                tickets_by_branch.setdefault(branch_name, []).append(ticket)
+            if ticket["needs_comment"]:
+                comment_future = jira_pool.submit(
+                    add_comment_to_jira_issue, ticket["jira_key"], test_case_content
+                )
+                pending[comment_future] = ("jira", ticket)
+            finish_branch_ticket(branch_name)
+
+        batch_size = max(batch_size or GEMINI_TEST_BATCH_SIZE, 1)
+        to_generate = [ticket for ticket in tickets if ticket["key"] not in saved_contents]
+        for start in range(0, len(to_generate), batch_size):
+            batch = to_generate[start:start + batch_size]
+            pending[llm_pool.submit(build_test_case_files, batch, output_dir)] = ("llm", batch)
+
+        for ticket in tickets:
+            if ticket["key"] in saved_contents:
+                done_steps += 1
+                accept_test_cases(ticket, saved_contents[ticket["key"]])
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, item = pending.pop(future)
+
+                if stage == "llm":
+                    done_steps += len(item)
+                    try:
+                        contents, errors = future.result()
+                    except Exception as e:
+                        contents, errors = {}, {ticket["key"]: e for ticket in item}
+
+                    for ticket in item:
+                        if ticket["key"] not in contents:
+                            report_test_case_error(ticket, errors.get(ticket["key"], "No test cases returned"), output_dir)
+                            summary["failed"] += 1
+                            # Its comment will never run, so drop that step from the total
+                            total_steps -= 1 if ticket["needs_comment"] else 0
+                            finish_branch_ticket(single_branch or ticket["branch_name"])
+                            continue
+
+                        summary["generated"] += 1
+                        journal_record("test_generate", output_dir, journal_node(ticket),
+                                       {"path": os.path.join(output_dir, f"{ticket['key']}_test_cases.md")})
+                        accept_test_cases(ticket, contents[ticket["key"]])
+                    continue
+
+                done_steps += 1
+                try:
+                    success, message = future.result()
+                except Exception as e:
+                    success, message = False, str(e)
+                if stage == "github":
+                    if success:
+                        summary["pushed"] += 1
+                        for ticket in tickets_by_branch.pop(item, []):
+                            journal_record("test_push", repo_name, push_node(ticket))
+                    else:
+                        summary["push_failed"] += 1
+                        notify("warning", f"Warning: {message}")
+
+                else:
+                    if success:
+                        summary["commented"] += 1
+                        journal_record("test_comment", JIRA_BASE_URL, comment_node(item))
+                    else:
+                        summary["comment_failed"] += 1
+                        notify("warning", f"Warning: Failed to add test cases to Jira issue {item['jira_key']}: {message}")
+
+            if progress_callback and total_steps:
+                progress_callback(
+                    min(done_steps / total_steps, 1.0),
+                    f"Generated {summary['generated']}/{len(tickets)} · "
+                    f"pushed {summary['pushed']} branches · commented {summary['commented']} issues"
+                )
+
+    return summary
@@ -1,185 +1,68 @@
 import streamlit as st
-import docx2txt
-import tempfile
-import requests
-import pandas as pd
+import html
 import os
-import re
+import sys
 import json
 import time
-from dotenv import load_dotenv
-from github import Github
-import google.generativeai as genai
-import PyPDF2
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Load credentials from environment variables
-JIRA_BASE_URL = os.getenv("JIRA_BASE_URL")
-JIRA_EMAIL = os.getenv("JIRA_EMAIL")
-JIRA_API_TOKEN = os.getenv("JIRA_API_TOKEN")
-JIRA_PROJECT_KEY = os.getenv("JIRA_PROJECT_KEY")
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-GITHUB_REPO = os.getenv("GITHUB_REPO")
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-genai.configure(api_key=GEMINI_API_KEY)
-
-# Initialize session state
-if 'tasks_data' not in st.session_state:
-    st.session_state.tasks_data = []
-if 'jira_created' not in st.session_state:
-    st.session_state.jira_created = False
-if 'branches_created' not in st.session_state:
-    st.session_state.branches_created = False
-if 'tests_created' not in st.session_state:
-    st.session_state.tests_created = False
-if 'selected_jira_key' not in st.session_state:
-    st.session_state.selected_jira_key = JIRA_PROJECT_KEY
-if 'selected_repo' not in st.session_state:
-    st.session_state.selected_repo = GITHUB_REPO
-if "view_and_manage" not in st.session_state:
-    st.session_state["view_and_manage"] = False
-
-# Your existing functions (keeping all of them)
-def extract_text_from_docx(docx_path):
-    return docx2txt.process(docx_path)
-
-def extract_text_from_pdf(pdf_path):
-    """Extract text from a PDF file."""
-    text = ""
-    try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-        return text
-    except Exception as e:
-        st.error(f"Error extracting text from PDF: {e}")
-        return None
-
-def extract_text_from_txt(txt_path):
-    """Extract text from a TXT file."""
-    try:
-        with open(txt_path, 'r', encoding='utf-8') as file:
-            return file.read()
-    except Exception as e:
-        st.error(f"Error extracting text from TXT: {e}")
-        return None
-
-def extract_text_from_file(file_path, file_type):
-    """Extract text from a file based on its type."""
-    if file_type == 'docx':
-        return extract_text_from_docx(file_path)
-    elif file_type == 'pdf':
-        return extract_text_from_pdf(file_path)
-    elif file_type == 'txt':
-        return extract_text_from_txt(file_path)
-    else:
-        st.error(f"Unsupported file type: {file_type}")
-        return None
 
-def prrse_tasks(text):
-    lines = text.split('\n')
-    return [line for line in lines if line.strip() != '']
-
-def clean_text(text):
-    return text.encode("utf-8", errors="ignore").decode("utf-8", errors="ignore")
-
-def summarize_with_gemini(text):
-    prompt = f"""
-Document Task Extraction for Jira Issues
-
-Please analyze the provided document (PDF, DOCX, or TXT) and extract all tasks that should be created as Jira issues. Organize them hierarchically as follows:
-
-1. Identify main tasks/topics that will serve as "Epics" in Jira
-2. Identify secondary tasks that will be "Tasks" under their respective Epics
-3. Identify detailed work items that will be "Subtasks" under their respective Tasks
-4. If a sub-subtask has its own subtasks, include them as sub-subtasks
-5. the description should be taken from the document
-6. keep the descriptions as short as possible but meaningful and concise which match in my document.
-7. make sure to don't miss-out and infromation from the document
-8. Do not include any sections related to Overview, Purpose, Scope, Tech stack suggestions, Time or hour estimates, Web design notes, Total days or effort summaries.
-Format the output as JSON with the following structure:
-{{
-  "tasks": [
-    {{
-      "title": "Main Task 1",
-      "description": "Take description of main task 1 from document",
-      "subtasks": [
-        {{
-          "title": "Subtask 1.1",
-          "description": "Take description of subtask 1.1 from document",
-          "subtasks": [
-            {{
-              "title": "Sub-subtask 1.1.1",
-              "description": "Take description of sub-subtask 1.1.1 from document"
-            }}
-          ]
-        }}
-      ]
-    }}
-  ]
-}}
-Important Guidelines:
-- don't add None, Select, and choose between  in description of tasks
-- if round brackets are used in the document then remove them from the description
-- if there are smimilar sub-tasks put them in under one related task 
-- if description is more than 200 characters then convert into subtasks
-- use only text from the document to fill in the JSON structure
-- Do not add any additional text or comments outside the JSON structure
-- don't include any explanations or summaries
-- don't use any extra text outside from the document
-- Stricly Don't use \n or \t in the title and description
-- Don't use any special characters in the title and description
-Given the following document content, remove any sections related to:
-- Overview Purpose Scope
-- Tech stack suggestions
-- Time or hour estimates
-- Web design notes
-- Total days or effort summaries
-Document Content:
-\"\"\"
-{text}
-\"\"\"
-"""
-    try:
-        model = genai.GenerativeModel("gemini-2.0-flash")
-        response = model.generate_content(prompt,
-        generation_config={"temperature": 0.1})
-        raw_output = response.text.strip()
-
-        match = re.search(r"\{[\s\S]*\}", raw_output)
-        if match:
-            return match.group(0)
-        else:
-            st.warning("No JSON block found in Gemini response.")
-            return raw_output  # fallback
-    except Exception as e:
-        st.error(f"Gemini API error: {e}")
-        return None
-
-# Your existing display and utility functions
-def count_tasks(tasks_data):
-    """Count total number of tasks, subtasks, and sub-subtasks"""
-    main_tasks = len(tasks_data)
-    subtasks_count = 0
-    sub_subtasks_count = 0
-    
-    for task in tasks_data:
-        if "subtasks" in task:
-            subtasks_count += len(task["subtasks"])
-            
-            for subtask in task["subtasks"]:
-                if "subtasks" in subtask:
-                    sub_subtasks_count += len(subtask["subtasks"])
-                    
-    return main_tasks, subtasks_count, sub_subtasks_count
-
-def display_task_statistics(tasks_data):
+from ai_project_manager.config import JIRA_PROJECT_KEY, GITHUB_REPO
+from ai_project_manager.documents import document_hash, ingest_document
+from ai_project_manager.github_api import (
+    collect_branch_names, create_github_branches_bulk, create_github_repo,
+    get_github_rate_limit, get_github_repos
+)
+from ai_project_manager.jira import (
+    JIRA_MAX_WORKERS, create_jira_issues_bulk, create_jira_issues_concurrent,
+    create_jira_project, get_jira_projects, record_jira_sync_state, sync_jira_issues
+)
+from ai_project_manager.journal import WORKFLOW_JOURNAL_FILE, clear_workflow_journal
+from ai_project_manager.llm import clear_llm_cache, get_llm_cache_state
+from ai_project_manager.resilience import get_service_guards
+from ai_project_manager.search import TaskSearchIndex
+from ai_project_manager.summarize import (
+    initial_sections_state, load_sections_state, save_sections_state,
+    stream_summarize_with_gemini, summarize_incrementally, summarize_with_gemini
+)
+from ai_project_manager.tasks import TaskTree
+from ai_project_manager.testcases import (
+    GEMINI_TEST_BATCH_SIZE, TEST_GITHUB_WORKERS, TEST_JIRA_WORKERS, TEST_LLM_WORKERS,
+    collect_test_case_tickets, run_test_case_pipeline
+)
+
+def init_session_state():
+    """Initialize session state"""
+    if 'task_tree' not in st.session_state:
+        st.session_state.task_tree = TaskTree()
+    if 'jira_created' not in st.session_state:
+        st.session_state.jira_created = False
+    if 'branches_created' not in st.session_state:
+        st.session_state.branches_created = False
+    if 'tests_created' not in st.session_state:
+        st.session_state.tests_created = False
+    if 'selected_jira_key' not in st.session_state:
+        st.session_state.selected_jira_key = JIRA_PROJECT_KEY
+    if 'selected_repo' not in st.session_state:
+        st.session_state.selected_repo = GITHUB_REPO
+    if "view_and_manage" not in st.session_state:
+        st.session_state["view_and_manage"] = False
+    if 'task_changes' not in st.session_state:
+        st.session_state.task_changes = None
+
+# Extracted text is memoized by upload content hash, so Streamlit reruns
+# triggered by other widgets don't parse the same document again
+INGEST_CACHE_ENTRIES = int(os.getenv("INGEST_CACHE_ENTRIES", "8"))
+
+@st.cache_data(max_entries=INGEST_CACHE_ENTRIES, show_spinner=False)
+def ingest_upload(content_hash, file_type, _buffer):
+    """Cached ingest_document(); keyed only by content_hash and file_type, the buffer is not hashed"""
+    return ingest_document(file_type, _buffer)
+
+def display_task_statistics(task_tree):
     """Display task statistics in a neat layout"""
-    main_tasks, subtasks_count, sub_subtasks_count = count_tasks(tasks_data)
-    total_tasks = main_tasks + subtasks_count + sub_subtasks_count
+    counts = task_tree.counts() + (0, 0, 0)
+    main_tasks, subtasks_count = counts[0], counts[1]
+    sub_subtasks_count = sum(counts[2:])  # everything below the second level
+    total_tasks = len(task_tree)
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -215,149 +98,217 @@ def display_task_statistics(tasks_data):
         </div>
         """, unsafe_allow_html=True)
 
-def display_sub_subtasks(sub_subtasks):
-    """Display sub-subtasks with nice formatting"""
-    for sub_subtask in sub_subtasks:
-        st.markdown(f"""
-        <div class="sub-subtask-container">
-            <div class="sub-subtask-title">{sub_subtask["title"]}</div>
-            <div class="sub-subtask-description">{sub_subtask.get("description", "")}</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-def display_subtasks(subtasks):
-    """Display subtasks with nice formatting"""
-    for subtask in subtasks:
-        st.markdown(f"""
-        <div class="subtask-container">
-            <div class="subtask-title">{subtask["title"]}</div>
-            <div class="subtask-description">{subtask.get("description", "")}</div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        if "subtasks" in subtask and subtask["subtasks"]:
-            display_sub_subtasks(subtask["subtasks"])
-
-def display_tasks(tasks_data):
-    """Display tasks with nice formatting"""
-    for task in tasks_data:
-        with st.expander(f"**{task['title']}**", expanded=False):
-            st.markdown(f"""
-            <div class="task-card">
-                <div class="task-title">{task["title"]}</div>
-                <div class="task-description">{task.get("description", "")}</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            if "subtasks" in task and task["subtasks"]:
-                display_subtasks(task["subtasks"])
-
-def display_task_table(tasks_data):
-    """Display tasks in a table format"""
-    table_data = []
-    
-    for task_idx, task in enumerate(tasks_data):
-        table_data.append({
-            "Level": "Main Task",
-            "ID": f"T{task_idx+1}",
-            "Title": task["title"],
-            "Description": task.get("description", "")
-        })
-        
-        if "subtasks" in task:
-            for subtask_idx, subtask in enumerate(task["subtasks"]):
-                table_data.append({
-                    "Level": "Subtask",
-                    "ID": f"T{task_idx+1}.{subtask_idx+1}",
-                    "Title": subtask["title"],
-                    "Description": subtask.get("description", "")
-                })
-                
-                if "subtasks" in subtask:
-                    for sub_subtask_idx, sub_subtask in enumerate(subtask["subtasks"]):
-                        table_data.append({
-                            "Level": "Sub-subtask",
-                            "ID": f"T{task_idx+1}.{subtask_idx+1}.{sub_subtask_idx+1}",
-                            "Title": sub_subtask["title"],
-                            "Description": sub_subtask.get("description", "")
-                        })
-    
-    df = pd.DataFrame(table_data)
-    st.dataframe(df, use_container_width=True, hide_index=True)
+def task_change_badge(node):
+    """Marker for nodes added or changed by the last incremental re-extraction"""
+    changes = st.session_state.get("task_changes") or {}
+    if node.id in changes.get("added", ()):
+        return "🆕 "
+    if node.id in changes.get("changed", ()):
+        return "✏️ "
+    return ""
+
+# NEW FUNCTIONALITY 18: PAGED TASK VIEWS
+# Both views render one page of the (filtered) pre-order node list, so a
+# large backlog costs a page worth of elements per rerun, not one per node.
+TASK_PAGE_SIZE = int(os.getenv("TASK_PAGE_SIZE", "50"))
+
+TASK_CARD_CLASSES = ("task", "subtask", "sub-subtask")  # CSS prefixes, deeper levels reuse the last
+
+def task_node_html(node):
+    """Card markup for one node, styled by its level"""
+    prefix = TASK_CARD_CLASSES[min(node.depth, len(TASK_CARD_CLASSES) - 1)]
+    container = "task-card" if node.depth == 0 else f"{prefix}-container"
+    return f"""
+    <div class="{container}">
+        <div class="{prefix}-title">{task_change_badge(node)}{html.escape(node.title)}</div>
+        <div class="{prefix}-description">{html.escape(node.description)}</div>
+    </div>
+    """
+
+def task_page_bounds(total, key):
+    """Page picker for `total` items; returns the (start, stop) window to render"""
+    pages = max(1, -(-total // TASK_PAGE_SIZE))
+    page = 1
+    if pages > 1:
+        # A narrower filter can leave the remembered page out of range
+        if st.session_state.get(key, 1) > pages:
+            st.session_state[key] = 1
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=key)
+    start = (page - 1) * TASK_PAGE_SIZE
+    stop = min(start + TASK_PAGE_SIZE, total)
+    if total:
+        st.caption(f"Showing {start + 1}–{stop} of {total}")
+    return start, stop
+
+def display_tasks(task_tree, nodes=None, page_key=None):
+    """Display one page of tasks with nice formatting.
+
+    nodes is a pre-order subset of the tree (all nodes by default). Each
+    main task on the page becomes one expander holding a single markdown
+    block for its visible descendants. Without page_key only the first page
+    is shown and no widgets are created, so it can be redrawn while
+    streaming.
+    """
+    nodes = task_tree.nodes if nodes is None else nodes
+    if page_key:
+        start, stop = task_page_bounds(len(nodes), page_key)
+    else:
+        start, stop = 0, min(len(nodes), TASK_PAGE_SIZE)
+
+    groups = []
+    for node in nodes[start:stop]:
+        root = node
+        while root.parent is not None:
+            root = root.parent
+        if not groups or groups[-1][0] is not root:
+            groups.append((root, []))
+        groups[-1][1].append(node)
+
+    for root, members in groups:
+        continued = "" if members[0] is root else " (continued)"
+        with st.expander(f"{task_change_badge(root)}**{root.title}**{continued}", expanded=False):
+            st.markdown("".join(task_node_html(node) for node in members), unsafe_allow_html=True)
+
+    if not page_key and len(nodes) > stop:
+        st.caption(f"… and {len(nodes) - stop} more")
+
+TASK_LEVEL_NAMES = ("Main Task", "Subtask", "Sub-subtask")
+TASK_LEVEL_ICONS = ("📋", "📝", "📌")
+
+def task_level_name(node):
+    if node.depth < len(TASK_LEVEL_NAMES):
+        return TASK_LEVEL_NAMES[node.depth]
+    return f"Level {node.depth + 1} task"
+
+def task_option_label(node):
+    """Indented selector entry such as '    └─ 📝 Subtask 1.2: Title'"""
+    icon = TASK_LEVEL_ICONS[min(node.depth, len(TASK_LEVEL_ICONS) - 1)]
+    prefix = "    " * node.depth + "└─ " if node.depth else ""
+    number = ".".join(str(position) for position in node.path)
+    return f"{prefix}{icon} {task_level_name(node)} {number}: {node.title}"
+
+def get_task_frame(task_tree):
+    """Table rows for every node as a DataFrame indexed by node id, built once per tree version"""
+    cached = st.session_state.get("task_frame_cache")
+    if cached and cached[0] is task_tree and cached[1] == task_tree.version:
+        return cached[2]
+
+    import pandas as pd  # only needed for the table view
+
+    nodes = task_tree.nodes
+    frame = pd.DataFrame(
+        {
+            "Level": [task_level_name(node) for node in nodes],
+            "ID": [node.label for node in nodes],
+            "Title": [node.title for node in nodes],
+            "Description": [node.description for node in nodes]
+        },
+        index=[node.id for node in nodes]
+    )
+    st.session_state.task_frame_cache = (task_tree, task_tree.version, frame)
+    return frame
+
+def display_task_table(task_tree, nodes=None, page_key="task_table_page"):
+    """Display one page of tasks (all, or the filtered pre-order subset) in a table"""
+    frame = get_task_frame(task_tree)
+    if nodes is not None:
+        frame = frame.loc[[node.id for node in nodes]]
+    start, stop = task_page_bounds(len(frame), page_key)
+    st.dataframe(frame.iloc[start:stop], use_container_width=True, hide_index=True)
+
+# NEW FUNCTIONALITY 19: TASK SEARCH
+TASK_SELECT_LIMIT = 25  # ranked matches offered by the editor's task pickers
+
+def get_task_search_index(task_tree):
+    """This session's search index, updated for nodes edited, added or deleted since the last call"""
+    if "task_search_index" not in st.session_state:
+        st.session_state.task_search_index = TaskSearchIndex()
+    return st.session_state.task_search_index.sync(task_tree)
+
+def filter_task_nodes(task_tree, query="", levels=None):
+    """Nodes matching the search query at the given level names, in tree order.
+
+    Ancestors of matches are kept so results still read as a hierarchy;
+    returns None when nothing is filtered.
+    """
+    if not query.strip() and not levels:
+        return None
+    found = set(get_task_search_index(task_tree).search(query)) if query.strip() else None
+    matched = set()
+    for node in task_tree.nodes:
+        if levels and task_level_name(node) not in levels:
+            continue
+        if found is not None and node.id not in found:
+            continue
+        ancestor = node
+        while ancestor is not None and ancestor.id not in matched:
+            matched.add(ancestor.id)
+            ancestor = ancestor.parent
+    return [node for node in task_tree.nodes if node.id in matched]
+
+def task_filter_interface(task_tree):
+    """Search box and level filter shared by the hierarchy and table views"""
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        query = st.text_input("🔍 Filter tasks", key="task_filter_query",
+                              placeholder="Search titles and descriptions, typos and word starts match")
+    with col2:
+        level_names = list(dict.fromkeys(task_level_name(node) for node in task_tree.nodes))
+        levels = st.multiselect("Levels", level_names, key="task_filter_levels")
+    nodes = filter_task_nodes(task_tree, query, levels)
+    if nodes is not None:
+        st.caption(f"{len(nodes)} of {len(task_tree)} tasks match")
+    return nodes
+
+def task_search_select(task_tree, label, placeholder, key, where=None):
+    """Search-as-you-type task picker; returns the chosen node id or None.
+
+    Lists the best TASK_SELECT_LIMIT matches for the query (or the first
+    nodes in tree order before anything is typed) instead of every node.
+    where optionally restricts which nodes can be picked.
+    """
+    query = st.text_input("🔍 Search for the task", key=f"{key}_query",
+                          placeholder="Type part of a title or description")
+    if query.strip():
+        ranked = get_task_search_index(task_tree).search(query, order=lambda node_id: task_tree.get(node_id).path)
+        candidates = [node_id for node_id in ranked if not where or where(task_tree.get(node_id))]
+        if not candidates:
+            st.caption("No matching tasks")
+    else:
+        candidates = [node.id for node in task_tree.nodes if not where or where(node)]
+        if len(candidates) > TASK_SELECT_LIMIT:
+            st.caption(f"Showing the first {TASK_SELECT_LIMIT} of {len(candidates)} tasks, type to search")
+    return st.selectbox(
+        label,
+        [None] + candidates[:TASK_SELECT_LIMIT],
+        format_func=lambda node_id: task_option_label(task_tree.get(node_id)) if node_id else placeholder,
+        key=key
+    )
 
 # NEW FUNCTIONALITY 1: TASK EDITING INTERFACE
-def edit_tasks_interface(tasks_data):
+def edit_tasks_interface(task_tree):
     """Interactive task editing interface"""
     st.subheader("🛠️ Task Management")
     
     edit_tab, add_tab, delete_tab = st.tabs(["✏️ Edit", "➕ Add", "🗑️ Delete"])
     
+    # Selectors hold node ids, so a selection survives renames and reordering
     with edit_tab:
         st.write("### Edit Existing Tasks")
         
-        # Create a flat list of all tasks for easy selection
-        task_options = ["Select a task to edit..."]
-        task_map = {}
+        selected_id = task_search_select(task_tree, "Select task to edit:", "Select a task to edit...", "edit_select")
         
-        for i, task in enumerate(tasks_data):
-            main_key = f"main_{i}"
-            task_options.append(f"📋 Main Task {i+1}: {task['title']}")
-            task_map[f"📋 Main Task {i+1}: {task['title']}"] = ("main", i, None, None)
+        if selected_id:
+            current_task = task_tree.get(selected_id)
+            level_name = task_level_name(current_task)
+            new_title = st.text_input("Title:", value=current_task.title, key=f"edit_title_{selected_id}")
+            new_description = st.text_area("Description:", value=current_task.description, key=f"edit_desc_{selected_id}")
             
-            if "subtasks" in task:
-                for j, subtask in enumerate(task["subtasks"]):
-                    sub_key = f"sub_{i}_{j}"
-                    task_options.append(f"    └─ 📝 Subtask {i+1}.{j+1}: {subtask['title']}")
-                    task_map[f"    └─ 📝 Subtask {i+1}.{j+1}: {subtask['title']}"] = ("sub", i, j, None)
-                    
-                    if "subtasks" in subtask:
-                        for k, sub_subtask in enumerate(subtask["subtasks"]):
-                            task_options.append(f"        └─ 📌 Sub-subtask {i+1}.{j+1}.{k+1}: {sub_subtask['title']}")
-                            task_map[f"        └─ 📌 Sub-subtask {i+1}.{j+1}.{k+1}: {sub_subtask['title']}"] = ("subsub", i, j, k)
-        
-        selected_task = st.selectbox("Select task to edit:", task_options)
-        
-        if selected_task != "Select a task to edit..." and selected_task in task_map:
-            task_type, main_idx, sub_idx, subsub_idx = task_map[selected_task]
-            
-            if task_type == "main":
-                current_task = tasks_data[main_idx]
-                new_title = st.text_input("Title:", value=current_task["title"], key="edit_main_title")
-                new_description = st.text_area("Description:", value=current_task.get("description", ""), key="edit_main_desc")
-                
-                if st.button("💾 Update Main Task", key="update_main"):
-                    tasks_data[main_idx]["title"] = new_title
-                    tasks_data[main_idx]["description"] = new_description
-                    st.session_state.tasks_data = tasks_data
-                    st.success("✅ Main task updated!")
-                    time.sleep(1)
-                    st.rerun()
-                    
-            elif task_type == "sub":
-                current_task = tasks_data[main_idx]["subtasks"][sub_idx]
-                new_title = st.text_input("Title:", value=current_task["title"], key="edit_sub_title")
-                new_description = st.text_area("Description:", value=current_task.get("description", ""), key="edit_sub_desc")
-                
-                if st.button("💾 Update Subtask", key="update_sub"):
-                    tasks_data[main_idx]["subtasks"][sub_idx]["title"] = new_title
-                    tasks_data[main_idx]["subtasks"][sub_idx]["description"] = new_description
-                    st.session_state.tasks_data = tasks_data
-                    st.success("✅ Subtask updated!")
-                    time.sleep(1)
-                    st.rerun()
-                    
-            elif task_type == "subsub":
-                current_task = tasks_data[main_idx]["subtasks"][sub_idx]["subtasks"][subsub_idx]
-                new_title = st.text_input("Title:", value=current_task["title"], key="edit_subsub_title")
-                new_description = st.text_area("Description:", value=current_task.get("description", ""), key="edit_subsub_desc")
-                
-                if st.button("💾 Update Sub-subtask", key="update_subsub"):
-                    tasks_data[main_idx]["subtasks"][sub_idx]["subtasks"][subsub_idx]["title"] = new_title
-                    tasks_data[main_idx]["subtasks"][sub_idx]["subtasks"][subsub_idx]["description"] = new_description
-                    st.session_state.tasks_data = tasks_data
-                    st.success("✅ Sub-subtask updated!")
-                    time.sleep(1)
-                    st.rerun()
+            if st.button(f"💾 Update {level_name}", key="update_task"):
+                task_tree.update(selected_id, title=new_title, description=new_description)
+                st.success(f"✅ {level_name} updated!")
+                time.sleep(1)
+                st.rerun()
     
     with add_tab:
         st.write("### Add New Tasks")
@@ -370,75 +321,36 @@ def edit_tasks_interface(tasks_data):
             new_description = st.text_area("New Main Task Description:", key="add_main_desc")
             
             if st.button("➕ Add Main Task", key="add_main") and new_title:
-                new_task = {
-                    "title": new_title,
-                    "description": new_description,
-                    "subtasks": []
-                }
-                tasks_data.append(new_task)
-                st.session_state.tasks_data = tasks_data
+                task_tree.add(new_title, new_description)
                 st.success("✅ Main task added!")
                 time.sleep(1)
                 st.rerun()
         
-        elif add_type == "Subtask":
-            if tasks_data:
-                main_task_options = [f"{i+1}: {task['title']}" for i, task in enumerate(tasks_data)]
-                selected_main = st.selectbox("Select parent main task:", main_task_options, key="select_main_for_sub")
-                
-                if selected_main:
-                    main_idx = int(selected_main.split(":")[0]) - 1
-                    new_title = st.text_input("New Subtask Title:", key="add_sub_title")
-                    new_description = st.text_area("New Subtask Description:", key="add_sub_desc")
-                    
-                    if st.button("➕ Add Subtask", key="add_sub") and new_title:
-                        new_subtask = {
-                            "title": new_title,
-                            "description": new_description,
-                            "subtasks": []
-                        }
-                        if "subtasks" not in tasks_data[main_idx]:
-                            tasks_data[main_idx]["subtasks"] = []
-                        tasks_data[main_idx]["subtasks"].append(new_subtask)
-                        st.session_state.tasks_data = tasks_data
-                        st.success("✅ Subtask added!")
-                        time.sleep(1)
-                        st.rerun()
+        else:
+            # Subtasks hang off main tasks, sub-subtasks off any subtask (nesting deeper)
+            if add_type == "Subtask":
+                can_parent = lambda node: node.depth == 0
             else:
-                st.warning("⚠️ Please add a main task first.")
-        
-        elif add_type == "Sub-subtask":
-            # Get available subtasks
-            subtask_options = []
-            subtask_map = {}
-            
-            for i, task in enumerate(tasks_data):
-                if "subtasks" in task:
-                    for j, subtask in enumerate(task["subtasks"]):
-                        option_text = f"Task {i+1}.{j+1}: {subtask['title']}"
-                        subtask_options.append(option_text)
-                        subtask_map[option_text] = (i, j)
+                can_parent = lambda node: node.depth >= 1
             
-            if subtask_options:
-                selected_subtask = st.selectbox("Select parent subtask:", subtask_options, key="select_sub_for_subsub")
+            if any(can_parent(node) for node in task_tree.nodes):
+                parent_id = task_search_select(
+                    task_tree,
+                    "Select parent main task:" if add_type == "Subtask" else "Select parent subtask:",
+                    "Select a parent task...",
+                    f"select_parent_for_{add_type}",
+                    where=can_parent
+                )
+                new_title = st.text_input(f"New {add_type} Title:", key=f"add_{add_type}_title")
+                new_description = st.text_area(f"New {add_type} Description:", key=f"add_{add_type}_desc")
                 
-                if selected_subtask:
-                    main_idx, sub_idx = subtask_map[selected_subtask]
-                    new_title = st.text_input("New Sub-subtask Title:", key="add_subsub_title")
-                    new_description = st.text_area("New Sub-subtask Description:", key="add_subsub_desc")
-                    
-                    if st.button("➕ Add Sub-subtask", key="add_subsub") and new_title:
-                        new_sub_subtask = {
-                            "title": new_title,
-                            "description": new_description
-                        }
-                        if "subtasks" not in tasks_data[main_idx]["subtasks"][sub_idx]:
-                            tasks_data[main_idx]["subtasks"][sub_idx]["subtasks"] = []
-                        tasks_data[main_idx]["subtasks"][sub_idx]["subtasks"].append(new_sub_subtask)
-                        st.session_state.tasks_data = tasks_data
-                        st.success("✅ Sub-subtask added!")
-                        time.sleep(1)
-                        st.rerun()
+                if st.button(f"➕ Add {add_type}", key=f"add_{add_type}") and new_title and parent_id:
+                    task_tree.add(new_title, new_description, parent_id=parent_id)
+                    st.success(f"✅ {add_type} added!")
+                    time.sleep(1)
+                    st.rerun()
+            elif add_type == "Subtask":
+                st.warning("⚠️ Please add a main task first.")
             else:
                 st.warning("⚠️ Please add subtasks first.")
     
@@ -446,45 +358,17 @@ def edit_tasks_interface(tasks_data):
         st.write("### Delete Tasks")
         st.warning("⚠️ Deletion cannot be undone!")
         
-        # Reuse the same task selection logic
-        task_options = ["Select a task to delete..."]
-        task_map = {}
-        
-        for i, task in enumerate(tasks_data):
-            task_options.append(f"📋 Main Task {i+1}: {task['title']}")
-            task_map[f"📋 Main Task {i+1}: {task['title']}"] = ("main", i, None, None)
-            
-            if "subtasks" in task:
-                for j, subtask in enumerate(task["subtasks"]):
-                    task_options.append(f"    └─ 📝 Subtask {i+1}.{j+1}: {subtask['title']}")
-                    task_map[f"    └─ 📝 Subtask {i+1}.{j+1}: {subtask['title']}"] = ("sub", i, j, None)
-                    
-                    if "subtasks" in subtask:
-                        for k, sub_subtask in enumerate(subtask["subtasks"]):
-                            task_options.append(f"        └─ 📌 Sub-subtask {i+1}.{j+1}.{k+1}: {sub_subtask['title']}")
-                            task_map[f"        └─ 📌 Sub-subtask {i+1}.{j+1}.{k+1}: {sub_subtask['title']}"] = ("subsub", i, j, k)
-        
-        selected_to_delete = st.selectbox("Select task to delete:", task_options, key="delete_select")
+        selected_to_delete = task_search_select(task_tree, "Select task to delete:", "Select a task to delete...",
+                                                "delete_select")
         
-        if selected_to_delete != "Select a task to delete..." and selected_to_delete in task_map:
-            task_type, main_idx, sub_idx, subsub_idx = task_map[selected_to_delete]
-            
-            st.error(f"You are about to delete: **{selected_to_delete}**")
+        if selected_to_delete:
+            st.error(f"You are about to delete: **{task_option_label(task_tree.get(selected_to_delete))}**")
             
             col1, col2 = st.columns(2)
             with col1:
                 if st.button("🗑️ Confirm Delete", type="secondary", key="confirm_delete"):
-                    if task_type == "main":
-                        deleted_task = tasks_data.pop(main_idx)
-                        st.success(f"✅ Deleted main task: {deleted_task['title']}")
-                    elif task_type == "sub":
-                        deleted_task = tasks_data[main_idx]["subtasks"].pop(sub_idx)
-                        st.success(f"✅ Deleted subtask: {deleted_task['title']}")
-                    elif task_type == "subsub":
-                        deleted_task = tasks_data[main_idx]["subtasks"][sub_idx]["subtasks"].pop(subsub_idx)
-                        st.success(f"✅ Deleted sub-subtask: {deleted_task['title']}")
-                    
-                    st.session_state.tasks_data = tasks_data
+                    deleted_task = task_tree.remove(selected_to_delete)
+                    st.success(f"✅ Deleted {task_level_name(deleted_task).lower()}: {deleted_task.title}")
                     time.sleep(1)
                     st.rerun()
             
@@ -492,139 +376,18 @@ def edit_tasks_interface(tasks_data):
                 if st.button("❌ Cancel", key="cancel_delete"):
                     st.info("Delete operation cancelled.")
     
-    return tasks_data
+    return task_tree
 
-def save_edited_tasks(tasks_data):
+def save_edited_tasks(task_tree):
     """Save edited tasks back to JSON file"""
     try:
-        with open("geminisummary.json", "w", encoding="utf-8") as f:
-            json.dump({"tasks": tasks_data}, f, indent=2, ensure_ascii=False)
+        task_tree.save()
         st.success("✅ Tasks saved successfully!")
         return True
     except Exception as e:
         st.error(f"❌ Failed to save tasks: {e}")
         return False
 
-# NEW FUNCTIONALITY 2: PROJECT SELECTION INTERFACE
-def get_jira_projects():
-    """Fetch available Jira projects"""
-    url = f"{JIRA_BASE_URL}/rest/api/3/project"
-    auth = (JIRA_EMAIL, JIRA_API_TOKEN)
-    try:
-        response = requests.get(url, auth=auth)
-        if response.status_code == 200:
-            projects = response.json()
-            return [(p["key"], p["name"]) for p in projects]
-        else:
-            st.error(f"Failed to fetch Jira projects: {response.status_code}")
-    except Exception as e:
-        st.error(f"Failed to fetch Jira projects: {e}")
-    return []
-
-def get_github_repos():
-    """Fetch available GitHub repositories"""
-    try:
-        g = Github(GITHUB_TOKEN)
-        user = g.get_user()
-        repos = user.get_repos()
-        return [(repo.full_name, repo.name) for repo in repos]
-    except Exception as e:
-        st.error(f"Failed to fetch GitHub repos: {e}")
-    return []
-def get_jira_account_id():
-    """Fetch the Atlassian accountId for the current Jira user."""
-    url = f"{JIRA_BASE_URL}/rest/api/3/myself"
-    auth = (JIRA_EMAIL, JIRA_API_TOKEN)
-    try:
-        response = requests.get(url, auth=auth)
-        if response.status_code == 200:
-            return response.json().get("accountId")
-        else:
-            st.error(f"Failed to fetch Jira accountId: {response.text}")
-    except Exception as e:
-        st.error(f"Error fetching Jira accountId: {e}")
-    return None
-def create_jira_project(project_key, project_name, project_type="software"):
-    """Create a new Jira project"""
-    url = f"{JIRA_BASE_URL}/rest/api/3/project"
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json"
-    }
-    auth = (JIRA_EMAIL, JIRA_API_TOKEN)
-
-    # Select correct template key based on project_type
-    template_keys = {
-        "software": "com.pyxis.greenhopper.jira:gh-simplified-agility-scrum",
-        "business": "com.atlassian.jira-core-project-templates:jira-core-simplified-process-control",
-        "service_desk": "com.atlassian.servicedesk:simplified-it-service-management"
-    }
-    projectTemplateKey = template_keys.get(project_type, template_keys["software"])
-
-    # Get the accountId for the project lead
-    lead_account_id = get_jira_account_id()
-    if not lead_account_id:
-        return False, "Could not fetch Jira accountId for project lead."
-
-    payload = {
-        "key": project_key,
-        "name": project_name,
-        "projectTypeKey": project_type,
-        "projectTemplateKey": projectTemplateKey,
-        "leadAccountId": lead_account_id
-    }
-
-    try:
-        response = requests.post(url, json=payload, headers=headers, auth=auth)
-        if response.status_code == 201:
-            return True, response.json()
-        else:
-            # Check for duplicate project name/key error
-            try:
-                error_json = response.json()
-                if (
-                    'errors' in error_json and (
-                        'projectName' in error_json['errors'] or 'projectKey' in error_json['errors']
-                    )
-                ):
-                    # st.error("A project with that name or key already exists.")
-                    return False, "A project with that name or key already exists please try with different name or key."
-            except Exception:
-                pass
-            return False, f"Failed to create project: {response.text}"
-    except Exception as e:
-        return False, f"Error creating project: {str(e)}"
-
-def create_github_repo(repo_name, description="", private=False):
-    """Create a new GitHub repository"""
-    try:
-        g = Github(GITHUB_TOKEN)
-        user = g.get_user()
-        repo = user.create_repo(
-            name=repo_name,
-            description=description,
-            private=private,
-            auto_init=True
-        )
-        return True, repo.full_name
-    except Exception as e:
-        # Check for duplicate repo name error
-        try:
-            if hasattr(e, 'data') and e.data:
-                error_json = e.data
-            else:
-                error_json = json.loads(str(e).split(':', 1)[-1].strip())
-            if (
-                isinstance(error_json, dict) and
-                error_json.get('errors') and
-                any(err.get('message', '').lower().find('name already exists') != -1 for err in error_json['errors'])
-            ):
-                # st.error("A repository with that name already exists on this account.")
-                return False, "A repository with that name already exists on this account please try with different name."
-        except Exception:
-            pass
-        return False, f"Failed to create repository: {str(e)}"
-
 def project_selection_interface():
     """Interface for selecting Jira project and GitHub repo"""
     st.subheader("🎯 Project Configuration")
@@ -750,286 +513,39 @@ def reset_workflow_state():
     st.session_state.branches_created = False
     st.session_state.tests_created = False
 
-# Your existing Jira and GitHub functions (keeping them all)
-def get_valid_issue_types():
-    url = f"{JIRA_BASE_URL}/rest/api/3/issuetype"
-    auth = (JIRA_EMAIL, JIRA_API_TOKEN)
-    response = requests.get(url, auth=auth)
-    if response.status_code == 200:
-        return [item["name"] for item in response.json()]
-    return []
-
-def create_jira_issue(summary, description, issue_type="Epic", parent_id=None, parent_type=None, project_key=None):
-    if not project_key:
-        project_key = st.session_state.selected_jira_key
-    
-    st.write(f"📝 Creating Jira issue: {summary}")
-
-    url = f"{JIRA_BASE_URL}/rest/api/3/issue"
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json"
-    }
-    auth = (JIRA_EMAIL, JIRA_API_TOKEN)
-
-    valid_types = get_valid_issue_types()
-
-    if not parent_id:
-        issue_type_name = "Epic"
-    elif parent_type == "Epic":
-        issue_type_name = "Task"
-    elif parent_type == "Task":
-        issue_type_name = "Subtask"
-    else:
-        issue_type_name = "Task"
-
-    if issue_type_name not in valid_types:
-        st.warning(f"⚠️ Issue type '{issue_type_name}' is invalid. Falling back to 'Task'.")
-        issue_type_name = "Task"
-
-    payload = {
-        "fields": {
-            "project": {"key": project_key},
-            "summary": summary,
-            "description": {
-                "type": "doc",
-                "version": 1,
-                "content": [
-                    {
-                        "type": "paragraph",
-                        "content": [{"type": "text", "text": description or ""}]
-                    }
-                ]
-            },
-            "issuetype": {"name": issue_type_name}
-        }
-    }
-
-    if issue_type_name == "Subtask" and parent_id:
-        payload["fields"]["parent"] = {"key": parent_id}
-    elif issue_type_name == "Task" and parent_id:
-        payload["fields"]["parent"] = {"key": parent_id}
-
-    response = requests.post(url, json=payload, headers=headers, auth=auth)
-
-    if response.status_code == 201:
-        issue_key = response.json().get("key")
-        st.success(f"✅ Created {issue_type_name}: {issue_key}")
-        
-        # Store the issue key in session state
-        if 'jira_issue_keys' not in st.session_state:
-            st.session_state.jira_issue_keys = {}
-        st.session_state.jira_issue_keys[summary] = issue_key
-        
-        return issue_key, issue_type_name
-    else:
-        st.error(f"❌ Failed to create {issue_type_name}: {summary}")
-        st.code(response.text)
-        return None, None
-
-def create_github_branch(branch_name, base="main", repo_name=None):
-    if not repo_name:
-        repo_name = st.session_state.selected_repo
-    
-    g = Github(GITHUB_TOKEN)
-    repo = g.get_repo(repo_name)
-
-    try:
-        source = repo.get_branch(base)
-    except Exception as e:
-        st.error(f"⚠️ Could not find base branch '{base}'. Check if it exists in your GitHub repo.")
-        st.stop()
-
-    repo.create_git_ref(ref=f"refs/heads/{branch_name}", sha=source.commit.sha)
-
-def generate_test_case_prompt(ticket):
-    """Generate a prompt for test case generation"""
-    return f"""
-You are a senior QA engineer. Based on the following task, write two detailed test cases including:
-- A title
-- Description
-- Steps
-- Expected Result
-- Priority
-
-Task:
-Title: {ticket['summary']}
-Description: {ticket['description']}
-"""
-
-def push_test_cases_to_branch(repo_name, branch_name, file_path, file_content):
-    """Push test case files to their respective GitHub branches"""
-    try:
-        g = Github(GITHUB_TOKEN)
-        repo = g.get_repo(repo_name)
-        
-        # Get the branch
-        branch = repo.get_branch(branch_name)
-        
-        # Create or update the file
-        try:
-            # Try to get the file first
-            contents = repo.get_contents(file_path, ref=branch_name)
-            # If file exists, update it
-            repo.update_file(
-                path=file_path,
-                message=f"Update test cases for {branch_name}",
-                content=file_content,
-                sha=contents.sha,
-                branch=branch_name
-            )
-        except Exception:
-            # If file doesn't exist, create it
-            repo.create_file(
-                path=file_path,
-                message=f"Add test cases for {branch_name}",
-                content=file_content,
-                branch=branch_name
-            )
-        
-        return True, f"Successfully pushed test cases to {branch_name}"
-    except Exception as e:
-        return False, f"Failed to push test cases: {str(e)}"
-
-def add_comment_to_jira_issue(issue_key, comment_content):
-    """Add a comment to a Jira issue"""
-    url = f"{JIRA_BASE_URL}/rest/api/3/issue/{issue_key}/comment"
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json"
-    }
-    auth = (JIRA_EMAIL, JIRA_API_TOKEN)
-    
-    payload = {
-        "body": {
-            "type": "doc",
-            "version": 1,
-            "content": [
-                {
-                    "type": "paragraph",
-                    "content": [{"type": "text", "text": comment_content}]
-                }
-            ]
-        }
-    }
-    
-    try:
-        response = requests.post(url, json=payload, headers=headers, auth=auth)
-        if response.status_code == 201:
-            return True, "Comment added successfully"
-        else:
-            return False, f"Failed to add comment: {response.text}"
-    except Exception as e:
-        return False, f"Error adding comment: {str(e)}"
-
-def simulate_test_case_generation_ai(ticket, output_dir="test_cases", repo_name=None, branch_name=None):
-    """Generate test cases using AI and optionally push to GitHub and Jira"""
-    import google.generativeai as genai
-    try:
-        os.makedirs(output_dir, exist_ok=True)
-        file_path = os.path.join(output_dir, f"{ticket['key']}_test_cases.md")
-
-        prompt = generate_test_case_prompt(ticket)
-
-        model = genai.GenerativeModel("gemini-2.0-flash")
-        response = model.generate_content(prompt)
-        ai_output = response.text.strip()
-
-        test_case_content = f"# Test Cases for {ticket['key']} - {ticket['summary']}\n\n{ai_output}"
-        
-        # Save locally
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(test_case_content)
-            
-        # If repo and branch are provided, push to GitHub
-        if repo_name and branch_name:
-            github_path = f"test_cases/{ticket['key']}_test_cases.md"
-            success, message = push_test_cases_to_branch(repo_name, branch_name, github_path, test_case_content)
-            if not success:
-                st.warning(f"Warning: {message}")
-            else:
-                st.success(f"✅ Test cases pushed to {branch_name}")
-        
-        # Add test cases as a comment in Jira
-        # Get the Jira issue key from the ticket
-        jira_issue_key = ticket.get('jira_key')  # This should be set when creating the Jira issue
-        if jira_issue_key:
-            success, message = add_comment_to_jira_issue(jira_issue_key, test_case_content)
-            if not success:
-                st.warning(f"Warning: Failed to add test cases to Jira issue {jira_issue_key}: {message}")
-            else:
-                st.success(f"✅ Test cases added to Jira issue {jira_issue_key}")
-                
-    except Exception as e:
-        st.error(f"❌ Error generating test cases for {ticket['key']}: {e}")
-        fallback_path = os.path.join(output_dir, f"{ticket['key']}_error.log")
-        with open(fallback_path, "w", encoding="utf-8") as f:
-            f.write(f"# Critical error while processing {ticket['key']}\nError: {str(e)}")
-
-def sanitize_branch_name(name):
-    name = name.replace(" ", "_")
-    name = re.sub(r'[^a-zA-Z0-9_\-\/]', '', name)
-    return name
-
-def walk_tasks_for_test_cases(tasks, parent_key="T", repo_name=None):
-    for idx, task in enumerate(tasks):
-        task_key = f"{parent_key}{idx+1}"
-        # Get the Jira issue key from session state
-        jira_key = st.session_state.jira_issue_keys.get(task.get("title", ""))
-        ticket = {
-            "key": task_key,
-            "summary": task.get("title", ""),
-            "description": task.get("description", ""),
-            "jira_key": jira_key  # Add the Jira issue key to the ticket
-        }
-        
-        # Generate branch name for this task
-        branch_name = f"feature_{idx+1}_{sanitize_branch_name(task['title'])}".lower()
-        
-        # Generate and push test cases
-        simulate_test_case_generation_ai(ticket, repo_name=repo_name, branch_name=branch_name)
-        
-        if "subtasks" in task and task["subtasks"]:
-            for st_idx, stask in enumerate(task["subtasks"]):
-                sub_task_key = f"{task_key}.{st_idx+1}"
-                # Get the Jira issue key for the subtask
-                sub_jira_key = st.session_state.jira_issue_keys.get(stask.get("title", ""))
-                sub_ticket = {
-                    "key": sub_task_key,
-                    "summary": stask.get("title", ""),
-                    "description": stask.get("description", ""),
-                    "jira_key": sub_jira_key  # Add the Jira issue key to the subtask
-                }
-                
-                # Generate branch name for this subtask
-                sub_branch_name = f"feature_{idx+1}_{st_idx+1}_{sanitize_branch_name(stask['title'])}".lower()
-                
-                # Generate and push test cases
-                simulate_test_case_generation_ai(sub_ticket, repo_name=repo_name, branch_name=sub_branch_name)
-                
-                if "subtasks" in stask and stask["subtasks"]:
-                    for sst_idx, sstask in enumerate(stask["subtasks"]):
-                        sub_sub_task_key = f"{sub_task_key}.{sst_idx+1}"
-                        # Get the Jira issue key for the sub-subtask
-                        sub_sub_jira_key = st.session_state.jira_issue_keys.get(sstask.get("title", ""))
-                        sub_sub_ticket = {
-                            "key": sub_sub_task_key,
-                            "summary": sstask.get("title", ""),
-                            "description": sstask.get("description", ""),
-                            "jira_key": sub_sub_jira_key  # Add the Jira issue key to the sub-subtask
-                        }
-                        
-                        # Generate branch name for this sub-subtask
-                        sub_sub_branch_name = f"feature_{idx+1}_{st_idx+1}_{sst_idx+1}_{sanitize_branch_name(sstask['title'])}".lower()
-                        
-                        # Generate and push test cases
-                        simulate_test_case_generation_ai(sub_sub_ticket, repo_name=repo_name, branch_name=sub_sub_branch_name)
+def store_jira_issue_key(summary, issue_key):
+    """Remember the created issue key so later workflow steps can find it"""
+    if 'jira_issue_keys' not in st.session_state:
+        st.session_state.jira_issue_keys = {}
+    st.session_state.jira_issue_keys[summary] = issue_key
+
+def walk_tasks_for_test_cases(tasks, parent_key="T", repo_name=None, single_branch=None,
+                              progress_callback=None, **pipeline_options):
+    """Generate test cases for the whole tree and push them with one commit per branch.
+
+    With single_branch set, every file from the run lands on that branch
+    (created from the base branch if needed) in a single commit.
+    pipeline_options are passed through to run_test_case_pipeline (worker
+    limits and batch_size).
+    """
+    summary = run_test_case_pipeline(
+        collect_test_case_tickets(tasks, parent_key, st.session_state.get("jira_issue_keys", {})),
+        repo_name=repo_name,
+        single_branch=single_branch,
+        progress_callback=progress_callback,
+        **pipeline_options
+    )
+    st.write(
+        f"🧪 Generated {summary['generated']} test case files, pushed {summary['pushed']} branches "
+        f"and commented on {summary['commented']} Jira issues"
+    )
+    if summary["skipped"]:
+        st.info(f"ℹ️ Skipped {summary['skipped']} tasks already completed in an earlier run")
+    return summary
 
 # MAIN STREAMLIT UI
-st.set_page_config(page_title="Jira Task Extractor App", layout="wide")
-
 # Custom CSS for styling
-st.markdown("""
+APP_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -1159,302 +675,436 @@ st.markdown("""
         color: #1E40AF !important;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-st.title("📄📌 Jira Task Extractor App")
+def main():
+    st.set_page_config(page_title="Jira Task Extractor App", layout="wide")
+    init_session_state()
+    st.markdown(APP_CSS, unsafe_allow_html=True)
+
+    st.title("📄📌 Jira Task Extractor App")
+
+    # Gemini response cache controls
+    with st.sidebar:
+        st.subheader("🗄️ Gemini Cache")
+        llm_cache_state = get_llm_cache_state()
+        llm_cache_state["bypass"] = st.checkbox("Bypass cache", value=llm_cache_state["bypass"], key="llm_cache_bypass")
+        st.caption(f"Hits: {llm_cache_state['hits']} · Misses: {llm_cache_state['misses']}")
+        if st.button("🧹 Clear cache", key="llm_cache_clear"):
+            clear_llm_cache()
+            st.rerun()
+
+        st.subheader("📶 API Throttling")
+        for service_name, guard in get_service_guards().items():
+            metrics = guard.metrics
+            st.caption(
+                f"**{service_name.title()}** · {guard.rate:.1f}/{guard.max_rate:g} req/s · "
+                f"{metrics['calls']} calls · {metrics['retries']} retries · "
+                f"{metrics['rate_limited']} rate-limited · {metrics['throttled_seconds']:.0f}s throttled"
+            )
 
-# Document Upload Section
-uploaded_file = st.file_uploader("Upload a project document", type=["docx", "pdf", "txt"])
+    # Document Upload Section
+    uploaded_file = st.file_uploader("Upload a project document", type=["docx", "pdf", "txt"])
+
+    if uploaded_file is not None:
+        file_extension = uploaded_file.name.split('.')[-1].lower()
+        # Zero-copy view of the upload, parsed in memory instead of via a temp file
+        file_buffer = uploaded_file.getbuffer()
+
+        st.success("File uploaded successfully!")
+
+        text, cleaned_text, tasks = ingest_upload(document_hash(file_buffer), file_extension, file_buffer)
+        if text:
+
+            st.subheader("Generating Summary")
+            stream_summary = st.checkbox("⚡ Show tasks as they are extracted", value=True, key="stream_summary")
+            incremental_update = False
+            if st.session_state.task_tree:
+                incremental_update = st.checkbox(
+                    "🧩 Incremental update (only re-extract changed sections, keep my edits)",
+                    key="incremental_update",
+                    help="Tasks extracted by an incremental update are removed when their sections are deleted. "
+                         "Tasks from a full extraction are kept; delete them in the task editor if needed."
+                )
+            generate_clicked = st.button("Generate Response")
+            if generate_clicked and incremental_update:
+                with st.spinner("Comparing sections and extracting changed tasks..."):
+                    result = summarize_incrementally(cleaned_text, st.session_state.task_tree.to_dicts(), load_sections_state())
+                if result:
+                    merged_tasks, sections_state, changes = result
+                    # Same document revised: keep the tree id so sync updates its issues
+                    merged_tree = TaskTree(merged_tasks, st.session_state.task_tree.tree_id)
+                    if save_edited_tasks(merged_tree):
+                        save_sections_state(sections_state)
+                        st.session_state.task_tree = merged_tree
+                        st.session_state.task_changes = changes
+                        reset_workflow_state()  # Reset workflow when tasks change
+                        st.info(
+                            f"🧩 {len(changes['added'])} added · {len(changes['changed'])} changed · "
+                            f"{len(changes['removed'])} removed"
+                        )
+                        if changes["removed"]:
+                            st.warning("🗑️ Removed (source sections deleted): " + ", ".join(changes["removed"]))
+            elif generate_clicked:
+                if stream_summary:
+                    stats_placeholder = st.empty()
+                    tasks_placeholder = st.empty()
+                    streamed_tasks = []
+                    try:
+                        with st.spinner("Analyzing document and extracting tasks..."):
+                            for streamed_tasks in stream_summarize_with_gemini(cleaned_text):
+                                streamed_tree = TaskTree(streamed_tasks)
+                                with stats_placeholder.container():
+                                    display_task_statistics(streamed_tree)
+                                with tasks_placeholder.container():
+                                    display_tasks(streamed_tree)
+                    except Exception as e:
+                        # A partial task list must not replace the saved one
+                        st.error(f"Gemini API error: {e}")
+                        st.warning("⚠️ Extraction did not finish; keeping the previous tasks.")
+                        streamed_tasks = []
+                    stats_placeholder.empty()
+                    tasks_placeholder.empty()
+                    summary = json.dumps({"tasks": streamed_tasks}, indent=2, ensure_ascii=False) if streamed_tasks else None
+                else:
+                    with st.spinner("Analyzing document and extracting tasks..."):
+                        summary = summarize_with_gemini(cleaned_text)
+
+                st.write("### Summary:")
+                if summary:
+                    with open("geminisummary.json", "w", encoding="utf-8") as f:
+                        f.write(summary)
+                    st.subheader("📦 JSON Task Summary")
+                    st.text_area("JSON Response", summary, height=300)
+
+                    # Parse and store in session state
+                    try:
+                        data = json.loads(summary)
+                        if "tasks" in data:
+                            st.session_state.task_tree = TaskTree(data["tasks"])
+                            st.session_state.task_changes = None
+                            save_edited_tasks(st.session_state.task_tree)
+                            save_sections_state(initial_sections_state(cleaned_text))
+                            reset_workflow_state()  # Reset workflow when new tasks are generated
+                    except json.JSONDecodeError:
+                        st.error("Failed to parse JSON response")
+                else:
+                    st.error("Failed to generate summary from the document.")
+        else:
+            st.warning("⚠️ No text could be extracted from this document (scanned PDFs have no text layer).")
 
-if uploaded_file is not None:
-    file_extension = uploaded_file.name.split('.')[-1].lower()
-    
-    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as tmp_file:
-        tmp_file.write(uploaded_file.read())
-        temp_file_path = tmp_file.name
+    # Task Management Section
+    use_saved = st.checkbox("🔁 View and manage extracted tasks", value=st.session_state["view_and_manage"], key="view_and_manage_checkbox")
+    st.session_state["view_and_manage"] = use_saved
+    if use_saved:
+        try:
+            # Try to load from file if session state is empty
+            loaded = False
+            if not st.session_state.task_tree:
+                st.session_state.task_tree = TaskTree.load()
+                loaded = True
+
+            task_tree = st.session_state.task_tree
 
-    st.success("File uploaded successfully!")
+            if task_tree:
+                if loaded:
+                    msg = st.success("Loaded tasks successfully!")
+                    time.sleep(1)
+                    msg.empty()
 
-    text = extract_text_from_file(temp_file_path, file_extension)
-    if text:
-        cleaned_text = clean_text(text)
-        tasks = prrse_tasks(text)
+                # Display task statistics
+                display_task_statistics(task_tree)
 
-        st.subheader("Generating Summary")
-        if st.button("Generate Response"):
-            with st.spinner("Analyzing document and extracting tasks..."):
-                summary = summarize_with_gemini(cleaned_text)
-            
-            st.write("### Summary:")
-            if summary:
-                with open("geminisummary.json", "w", encoding="utf-8") as f:
-                    f.write(summary)
-                st.subheader("📦 JSON Task Summary")
-                st.text_area("JSON Response", summary, height=300)
-                
-                # Parse and store in session state
-                try:
-                    data = json.loads(summary)
-                    if "tasks" in data:
-                        st.session_state.tasks_data = data["tasks"]
-                        reset_workflow_state()  # Reset workflow when new tasks are generated
-                except json.JSONDecodeError:
-                    st.error("Failed to parse JSON response")
-            else:
-                st.error("Failed to generate summary from the document.")
+                visible_nodes = task_filter_interface(task_tree)
 
-    os.unlink(temp_file_path)
+                # Main task display tabs
+                tab1, tab2 = st.tabs(["📋 Task Hierarchy", "📊 Task Table"])
 
-# Task Management Section
-use_saved = st.checkbox("🔁 View and manage extracted tasks", value=st.session_state["view_and_manage"], key="view_and_manage_checkbox")
-st.session_state["view_and_manage"] = use_saved
-if use_saved:
-    try:
-        # Try to load from file if session state is empty
-        if not st.session_state.tasks_data:
-            with open("geminisummary.json", "r", encoding="utf-8") as f:
-                summary = f.read()
-                data = json.loads(summary)
-                if "tasks" in data:
-                    st.session_state.tasks_data = data["tasks"]
-        
-        tasks_data = st.session_state.tasks_data
-        
-        if tasks_data:
-            msg = st.success("Loaded tasks successfully!")
-            time.sleep(1)
-            msg.empty()
-            
-            # Display task statistics
-            display_task_statistics(tasks_data)
-            
-            # Main task display tabs
-            tab1, tab2 = st.tabs(["📋 Task Hierarchy", "📊 Task Table"])
-            
-            with tab1:
-                display_tasks(tasks_data)
-            with tab2:
-                display_task_table(tasks_data)
+                with tab1:
+                    display_tasks(task_tree, visible_nodes, page_key="task_hierarchy_page")
+                with tab2:
+                    display_task_table(task_tree, visible_nodes)
 
-            # ENHANCED TASK MANAGEMENT SECTION
-            st.markdown("---")
-            
-            # Task editing interface
-            edit_tasks = st.checkbox("🛠️ Edit/Add/Delete Tasks")
-            if edit_tasks:
-                st.session_state.tasks_data = edit_tasks_interface(st.session_state.tasks_data)
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("💾 Save Changes", type="primary"):
-                        if save_edited_tasks(st.session_state.tasks_data):
+                # ENHANCED TASK MANAGEMENT SECTION
+                st.markdown("---")
+
+                # Task editing interface
+                edit_tasks = st.checkbox("🛠️ Edit/Add/Delete Tasks")
+                if edit_tasks:
+                    task_tree = edit_tasks_interface(task_tree)
+
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if st.button("💾 Save Changes", type="primary"):
+                            if save_edited_tasks(task_tree):
+                                st.rerun()
+
+                    with col2:
+                        if st.button("🔄 Reset to Saved", type="secondary"):
+                            st.session_state.task_tree = TaskTree.load()
+                            st.success("Reset to last saved version!")
                             st.rerun()
-                
-                with col2:
-                    if st.button("🔄 Reset to Saved", type="secondary"):
-                        with open("geminisummary.json", "r", encoding="utf-8") as f:
-                            data = json.loads(f.read())
-                            st.session_state.tasks_data = data["tasks"]
-                        st.success("Reset to last saved version!")
-                        st.rerun()
-
-            # Task confirmation and workflow
-            st.markdown("---")
-            st.subheader("🚀 Development Workflow")
-            
-            # Workflow progress indicator
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                if st.session_state.jira_created:
-                    st.success("✅ Jira Issues Created")
-                else:
-                    st.info("⏳ Jira Issues Pending")
-            
-            with col2:
-                if st.session_state.branches_created:
-                    st.success("✅ GitHub Branches Created")
-                else:
-                    st.info("⏳ GitHub Branches Pending")
-            
-            with col3:
-                if st.session_state.tests_created:
-                    st.success("✅ Test Cases Generated")
-                else:
-                    st.info("⏳ Test Cases Pending")
 
-            # Task confirmation
-            task_confirmed = st.checkbox("✅ Confirm tasks are ready for development")
-            
-            if task_confirmed:
-                st.success("Tasks confirmed! Ready to proceed with project setup.")
-                
-                # Project selection interface
-                selected_jira_key, selected_repo = project_selection_interface()
-                
-                # Store selections in session state
-                st.session_state.selected_jira_key = selected_jira_key
-                st.session_state.selected_repo = selected_repo
-                
+                # Task confirmation and workflow
                 st.markdown("---")
-                st.subheader("⚡ Execute Workflow")
-                
-                # Workflow execution buttons with validation
+                st.subheader("🚀 Development Workflow")
+
+                # Workflow progress indicator
                 col1, col2, col3 = st.columns(3)
-                
                 with col1:
-                    can_create_jira, jira_msg = validate_workflow_step("jira_creation")
-                    
-                    if st.button("📋 Create Jira Issues", 
-                               type="primary",
-                               disabled=not can_create_jira,
-                               key="workflow_create_jira_btn"):
-                        
-                        try:
-                            with st.spinner("Creating Jira issues..."):
-                                progress_bar = st.progress(0)
-                                total_tasks = len(tasks_data)
-                                
-                                for idx, t in enumerate(tasks_data):
-                                    epic_key, epic_type = create_jira_issue(
-                                        t["title"], 
-                                        t.get("description", ""),
-                                        project_key=selected_jira_key
-                                    )
-                                    
-                                    if epic_key:
-                                        for stask in t.get("subtasks", []):
-                                            task_key, task_type = create_jira_issue(
-                                                stask["title"], 
-                                                stask.get("description", ""),
-                                                parent_id=epic_key, 
-                                                parent_type=epic_type,
-                                                project_key=selected_jira_key
-                                            )
-                                            
-                                            if task_key:
-                                                for sstask in stask.get("subtasks", []):
-                                                    create_jira_issue(
-                                                        sstask["title"], 
-                                                        sstask.get("description", ""),
-                                                        parent_id=task_key, 
-                                                        parent_type=task_type,
-                                                        project_key=selected_jira_key
-                                                    )
-                                    
-                                    progress_bar.progress((idx + 1) / total_tasks)
-                                
-                                progress_bar.empty()
-                            
-                            st.success("🎉 All Jira issues created successfully!")
-                            st.session_state.jira_created = True
-                            time.sleep(1)
-                            st.rerun()
-                            
-                        except Exception as e:
-                            st.error(f"❌ Jira issue creation failed: {e}")
-                    
-                    if not can_create_jira:
-                        st.warning(jira_msg)
-                
+                    if st.session_state.jira_created:
+                        st.success("✅ Jira Issues Created")
+                    else:
+                        st.info("⏳ Jira Issues Pending")
+
                 with col2:
-                    can_create_branches, branch_msg = validate_workflow_step("branch_creation", ["jira_created"])
-                    
-                    if st.button("🌿 Create GitHub Branches", 
-                               type="primary" if can_create_branches else "secondary",
-                               disabled=not can_create_branches,
-                               key="workflow_create_branches_btn"):
-                        
-                        try:
-                            with st.spinner("Creating GitHub branches..."):
-                                progress_bar = st.progress(0)
-                                total_operations = 0
-                                
-                                # Count total operations
-                                for t in tasks_data:
-                                    total_operations += 1
-                                    total_operations += len(t.get("subtasks", []))
-                                    for stask in t.get("subtasks", []):
-                                        total_operations += len(stask.get("subtasks", []))
-                                
-                                current_op = 0
-                                
-                                for t_idx, t in enumerate(tasks_data):
-                                    branch_name = f"feature_{t_idx+1}_{sanitize_branch_name(t['title'])}".lower()
-                                    create_github_branch(branch_name, repo_name=selected_repo)
-                                    current_op += 1
-                                    progress_bar.progress(current_op / total_operations)
-                                    
-                                    for st_idx, stask in enumerate(t.get("subtasks", [])):
-                                        sub_branch_name = f"feature_{t_idx+1}_{st_idx+1}_{sanitize_branch_name(stask['title'])}".lower()
-                                        create_github_branch(sub_branch_name, repo_name=selected_repo)
-                                        current_op += 1
-                                        progress_bar.progress(current_op / total_operations)
-                                        
-                                        for sst_idx, sstask in enumerate(stask.get("subtasks", [])):
-                                            sub_sub_branch_name = f"feature_{t_idx+1}_{st_idx+1}_{sst_idx+1}_{sanitize_branch_name(sstask['title'])}".lower()
-                                            create_github_branch(sub_sub_branch_name, repo_name=selected_repo)
-                                            current_op += 1
-                                            progress_bar.progress(current_op / total_operations)
-                                
-                                progress_bar.empty()
-                            
-                            st.success("🌿 All GitHub branches created successfully!")
-                            st.session_state.branches_created = True
-                            time.sleep(1)
-                            st.rerun()
-                            
-                        except Exception as e:
-                            st.error(f"❌ Branch creation failed: {e}")
-                    
-                    if not can_create_branches:
-                        st.warning(branch_msg)
-                
+                    if st.session_state.branches_created:
+                        st.success("✅ GitHub Branches Created")
+                    else:
+                        st.info("⏳ GitHub Branches Pending")
+
                 with col3:
-                    can_create_tests, test_msg = validate_workflow_step("test_creation", ["jira_created", "branches_created"])
-                    
-                    if st.button("🧪 Generate & Push Test Cases", 
-                               type="primary" if can_create_tests else "secondary",
-                               disabled=not can_create_tests,
-                               key="workflow_create_tests_btn"):
-                        
-                        try:
-                            with st.spinner("Generating and pushing test cases..."):
-                                walk_tasks_for_test_cases(tasks_data, repo_name=selected_repo)
-                            
-                            st.success("🧪 Test cases generated and pushed successfully!")
-                            st.session_state.tests_created = True
-                            time.sleep(1)
+                    if st.session_state.tests_created:
+                        st.success("✅ Test Cases Generated")
+                    else:
+                        st.info("⏳ Test Cases Pending")
+
+                # Task confirmation
+                task_confirmed = st.checkbox("✅ Confirm tasks are ready for development")
+
+                if task_confirmed:
+                    st.success("Tasks confirmed! Ready to proceed with project setup.")
+
+                    # Project selection interface
+                    selected_jira_key, selected_repo = project_selection_interface()
+
+                    # Store selections in session state
+                    st.session_state.selected_jira_key = selected_jira_key
+                    st.session_state.selected_repo = selected_repo
+
+                    st.markdown("---")
+                    st.subheader("⚡ Execute Workflow")
+                    if os.path.exists(WORKFLOW_JOURNAL_FILE):
+                        st.caption("Completed side effects are journaled, so re-running a step resumes where it stopped.")
+                        if st.button("🧹 Clear workflow journal", key="clear_workflow_journal_btn"):
+                            clear_workflow_journal()
                             st.rerun()
-                            
-                        except Exception as e:
-                            st.error(f"❌ Test case generation and pushing failed: {e}")
-                    
-                    if not can_create_tests:
-                        st.warning(test_msg)
-                
-                # Workflow completion status
-                if all([
-                    st.session_state.jira_created,
-                    st.session_state.branches_created,
-                    st.session_state.tests_created
-                ]):
-                    st.balloons()
-                    st.success("🎉 Complete workflow executed successfully!")
-                    st.info("Your document has been transformed into a complete development workflow!")
-                    
-                    # Option to reset workflow
-                    if st.button("🔄 Start New Workflow", type="secondary"):
-                        st.session_state["view_and_manage"] = False  # Custom session var to control checkbox
-                        reset_workflow_state()
-                        st.rerun()
-        
-        else:
-            st.warning("No tasks found. Please upload a document and generate tasks first.")
-    
-    except FileNotFoundError:
-        st.error("JSON file not found. Please upload a document and generate tasks first.")
-    except json.JSONDecodeError:
-        st.error("Could not parse JSON from file.")
-    except Exception as e:
-        st.error(f"An error occurred: {e}")
 
+                    # Workflow execution buttons with validation
+                    col1, col2, col3 = st.columns(3)
+
+                    with col1:
+                        can_create_jira, jira_msg = validate_workflow_step("jira_creation")
+
+                        jira_creation_mode = st.radio("Creation mode:",
+                                                      ["Bulk", "Concurrent", "Sync changes"],
+                                                      horizontal=True,
+                                                      key="jira_creation_mode")
+                        jira_max_workers = JIRA_MAX_WORKERS
+                        if jira_creation_mode == "Sync changes":
+                            st.caption("Only creates, updates or closes issues for nodes changed since the last push.")
+                        if jira_creation_mode != "Bulk":
+                            jira_max_workers = st.number_input("Parallel requests:", min_value=1, max_value=32,
+                                                               value=JIRA_MAX_WORKERS, key="jira_max_workers")
+
+                        if st.button("📋 Create Jira Issues", 
+                                   type="primary",
+                                   disabled=not can_create_jira,
+                                   key="workflow_create_jira_btn"):
+
+                            try:
+                                tasks_data = task_tree.to_dicts()
+                                with st.spinner("Creating Jira issues..."):
+                                    progress_bar = st.progress(0)
+                                    if jira_creation_mode == "Sync changes":
+                                        results = sync_jira_issues(
+                                            tasks_data,
+                                            task_tree.tree_id,
+                                            project_key=selected_jira_key,
+                                            max_workers=jira_max_workers,
+                                            progress_callback=progress_bar.progress
+                                        )
+                                    elif jira_creation_mode == "Concurrent":
+                                        results = create_jira_issues_concurrent(
+                                            tasks_data,
+                                            project_key=selected_jira_key,
+                                            max_workers=jira_max_workers,
+                                            progress_callback=progress_bar.progress
+                                        )
+                                    else:
+                                        results = create_jira_issues_bulk(
+                                            tasks_data,
+                                            project_key=selected_jira_key,
+                                            progress_callback=progress_bar.progress
+                                        )
+                                    progress_bar.empty()
+
+                                # Later workflow steps look keys up by title, reused and unchanged nodes included
+                                for r in results:
+                                    if r["key"]:
+                                        store_jira_issue_key(r["title"], r["key"])
+
+                                if jira_creation_mode == "Sync changes":
+                                    failed = [r for r in results if r["error"]]
+                                    counts = {action: sum(1 for r in results if r["action"] == action and not r["error"])
+                                              for action in ("created", "updated", "closed", "unchanged")}
+                                    st.write(
+                                        f"🔄 Created {counts['created']} · Updated {counts['updated']} · "
+                                        f"Closed {counts['closed']} · Unchanged {counts['unchanged']}"
+                                    )
+                                else:
+                                    record_jira_sync_state(tasks_data, results, selected_jira_key, task_tree.tree_id)
+                                    created = [r for r in results if r["key"]]
+                                    failed = [r for r in results if not r["key"]]
+                                    st.write(f"📝 Created {len(created)} of {len(results)} Jira issues")
+                                    resumed = sum(1 for r in results if r["resumed"])
+                                    if resumed:
+                                        st.info(f"ℹ️ {resumed} issues were already created by an earlier run and were reused")
+                                for r in failed:
+                                    node_id = "T" + ".".join(str(i) for i in r["path"]) if r["path"] else r["key"]
+                                    verb = {"updated": "update", "closed": "close"}.get(r.get("action"), "create")
+                                    st.error(f"❌ Failed to {verb} {node_id} {r['title']}: {r['error']}")
+
+                                st.session_state.jira_created = True
+                                if failed:
+                                    # Keep the per-node errors on screen instead of rerunning
+                                    st.warning(f"⚠️ {len(failed)} Jira issues could not be created.")
+                                else:
+                                    st.success("🎉 All Jira issues created successfully!")
+                                    time.sleep(1)
+                                    st.rerun()
+
+                            except Exception as e:
+                                st.error(f"❌ Jira issue creation failed: {e}")
+
+                        if not can_create_jira:
+                            st.warning(jira_msg)
+
+                    with col2:
+                        can_create_branches, branch_msg = validate_workflow_step("branch_creation", ["jira_created"])
+
+                        if st.button("🌿 Create GitHub Branches", 
+                                   type="primary" if can_create_branches else "secondary",
+                                   disabled=not can_create_branches,
+                                   key="workflow_create_branches_btn"):
+
+                            try:
+                                with st.spinner("Creating GitHub branches..."):
+                                    progress_bar = st.progress(0)
+                                    created, existing, failed = create_github_branches_bulk(
+                                        collect_branch_names(task_tree.to_dicts()),
+                                        repo_name=selected_repo,
+                                        progress_callback=progress_bar.progress
+                                    )
+                                    progress_bar.empty()
+
+                                st.write(f"🌿 Created {len(created)} branches")
+                                if existing:
+                                    st.info(f"ℹ️ {len(existing)} branches already existed: {', '.join(existing)}")
+                                for branch_name, error in failed.items():
+                                    st.error(f"❌ Failed to create branch {branch_name}: {error}")
+
+                                st.session_state.branches_created = True
+                                if failed:
+                                    st.warning(f"⚠️ {len(failed)} branches could not be created.")
+                                else:
+                                    st.success("🌿 All GitHub branches created successfully!")
+                                    time.sleep(1)
+                                    st.rerun()
+
+                            except Exception as e:
+                                st.error(f"❌ Branch creation failed: {e}")
+
+                        if not can_create_branches:
+                            st.warning(branch_msg)
+
+                        remaining, limit = get_github_rate_limit()
+                        if remaining is not None:
+                            st.caption(f"GitHub API calls remaining: {remaining}/{limit}")
+
+                    with col3:
+                        can_create_tests, test_msg = validate_workflow_step("test_creation", ["jira_created", "branches_created"])
+
+                        single_test_branch = st.checkbox("Commit all test cases to one `test-cases` branch",
+                                                         key="single_test_branch")
+                        with st.expander("⚙️ Generation settings"):
+                            test_batch_size = st.number_input("Tickets per Gemini prompt:", min_value=1, max_value=20,
+                                                              value=GEMINI_TEST_BATCH_SIZE, key="test_batch_size")
+                            llm_workers = st.number_input("Gemini workers:", min_value=1, max_value=16,
+                                                          value=TEST_LLM_WORKERS, key="test_llm_workers")
+                            github_workers = st.number_input("GitHub workers:", min_value=1, max_value=16,
+                                                             value=TEST_GITHUB_WORKERS, key="test_github_workers")
+                            jira_workers = st.number_input("Jira workers:", min_value=1, max_value=16,
+                                                           value=TEST_JIRA_WORKERS, key="test_jira_workers")
+
+                        if st.button("🧪 Generate & Push Test Cases", 
+                                   type="primary" if can_create_tests else "secondary",
+                                   disabled=not can_create_tests,
+                                   key="workflow_create_tests_btn"):
+
+                            try:
+                                with st.spinner("Generating and pushing test cases..."):
+                                    progress_bar = st.progress(0)
+                                    summary = walk_tasks_for_test_cases(
+                                        task_tree.to_dicts(),
+                                        repo_name=selected_repo,
+                                        single_branch="test-cases" if single_test_branch else None,
+                                        progress_callback=lambda value, text: progress_bar.progress(value, text=text),
+                                        llm_workers=llm_workers,
+                                        github_workers=github_workers,
+                                        jira_workers=jira_workers,
+                                        batch_size=test_batch_size
+                                    )
+                                    progress_bar.empty()
+
+                                st.session_state.tests_created = True
+                                if summary["failed"] or summary["push_failed"] or summary["comment_failed"]:
+                                    st.warning(
+                                        f"⚠️ Test case generation failed for {summary['failed']} tasks, "
+                                        f"pushing for {summary['push_failed']} branches and "
+                                        f"commenting for {summary['comment_failed']} Jira issues."
+                                    )
+                                else:
+                                    st.success("🧪 Test cases generated and pushed successfully!")
+                                    time.sleep(1)
+                                    st.rerun()
+
+                            except Exception as e:
+                                st.error(f"❌ Test case generation and pushing failed: {e}")
+
+                        if not can_create_tests:
+                            st.warning(test_msg)
+
+                    # Workflow completion status
+                    if all([
+                        st.session_state.jira_created,
+                        st.session_state.branches_created,
+                        st.session_state.tests_created
+                    ]):
+                        st.balloons()
+                        st.success("🎉 Complete workflow executed successfully!")
+                        st.info("Your document has been transformed into a complete development workflow!")
+
+                        # Option to reset workflow
+                        if st.button("🔄 Start New Workflow", type="secondary"):
+                            st.session_state["view_and_manage"] = False  # Custom session var to control checkbox
+                            reset_workflow_state()
+                            st.rerun()
+
+            else:
+                st.warning("No tasks found. Please upload a document and generate tasks first.")
+
+        except FileNotFoundError:
+            st.error("JSON file not found. Please upload a document and generate tasks first.")
+        except json.JSONDecodeError:
+            st.error("Could not parse JSON from file.")
+        except Exception as e:
+            st.error(f"An error occurred: {e}")
+
+if __name__ == "__main__":
+    # `streamlit run` also executes this file as __main__; plain `python` gets the CLI
+    if st.runtime.exists():
+        main()
+    else:
+        from ai_project_manager.cli import run_cli
+        sys.exit(run_cli())
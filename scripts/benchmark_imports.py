@@ -0,0 +1,45 @@
+"""Compare cold import times of the core library, the app and its heavy dependencies.
+
+Each import runs in a fresh interpreter so nothing is cached between runs:
+
+    python scripts/benchmark_imports.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = [
+    ("ai_project_manager", "import ai_project_manager"),
+    ("ai_project_manager.tasks", "import ai_project_manager.tasks"),
+    ("ai_project_manager.cli", "import ai_project_manager.cli"),
+    ("eager third-party imports", "import streamlit, pandas, github, google.generativeai, PyPDF2, docx2txt"),
+    ("enhanced_jira_app", "import enhanced_jira_app"),
+]
+
+def time_import(statement):
+    """Seconds a fresh interpreter spends on statement, excluding interpreter startup"""
+    code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return float(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target")
+    args = parser.parse_args()
+
+    for label, statement in TARGETS:
+        try:
+            timings = [time_import(statement) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{label:<28} failed: {e}")
+            continue
+        print(f"{label:<28} median {statistics.median(timings) * 1000:8.1f} ms   min {min(timings) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import os
+
+import pytest
+
+from ai_project_manager import jira
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self._data = data
+        self.text = str(data)
+
+    def json(self):
+        return self._data
+
+
+class FakeJira:
+    """Creates keys FAKE-1, FAKE-2, ... and remembers every request"""
+
+    def __init__(self, bulk_response=None):
+        self.bulk_response = bulk_response
+        self.calls = []
+        self.created = 0
+
+    def next_key(self):
+        self.created += 1
+        return f"FAKE-{self.created}"
+
+    def post(self, path, json=None):
+        self.calls.append(("POST", path, json))
+        if path.endswith("/issue/bulk"):
+            if self.bulk_response:
+                return self.bulk_response
+            return FakeResponse(201, {"issues": [{"key": self.next_key()} for _ in json["issueUpdates"]], "errors": []})
+        if path.endswith("/transitions"):
+            return FakeResponse(204)
+        return FakeResponse(201, {"key": self.next_key()})
+
+    def put(self, path, json=None):
+        self.calls.append(("PUT", path, json))
+        return FakeResponse(204)
+
+    def get(self, path):
+        self.calls.append(("GET", path, None))
+        return FakeResponse(200, {"transitions": [{"id": "31", "to": {"statusCategory": {"key": "done"}}}]})
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    fake = FakeJira()
+    monkeypatch.setattr(jira, "get_jira_client", lambda: fake)
+    monkeypatch.setattr(jira, "get_valid_issue_types", lambda project_key=None: ["Epic", "Task", "Subtask"])
+    return fake
+
+
+def test_bulk_maps_issues_to_payloads_around_failed_elements(client):
+    client.bulk_response = FakeResponse(400, {
+        "issues": [{"key": "A-1"}, {"key": "A-3"}],
+        "errors": [{"failedElementNumber": 1, "elementErrors": {"errors": {"summary": "too long"}}}],
+    })
+    results, rejected = jira.post_jira_issues_bulk([{}, {}, {}])
+    assert [key for key, _ in results] == ["A-1", None, "A-3"]
+    assert "too long" in results[1][1]
+    assert rejected == {1}
+
+
+def test_bulk_marks_missing_issues_as_unknown_not_rejected(client):
+    client.bulk_response = FakeResponse(201, {"issues": [{"key": "A-1"}], "errors": []})
+    results, rejected = jira.post_jira_issues_bulk([{}, {}])
+    assert results == [("A-1", None), (None, "Missing from bulk response")]
+    assert rejected == set()
+
+
+def test_batch_retries_only_rejected_items(client):
+    client.bulk_response = FakeResponse(400, {
+        "issues": [{"key": "A-1"}],
+        "errors": [{"failedElementNumber": 1, "elementErrors": {"errors": {"summary": "bad"}}}],
+    })
+    results = jira.post_jira_issues_batch([{"n": 0}, {"n": 1}])
+    assert results == [("A-1", None), ("FAKE-1", None)]
+    single_posts = [call for call in client.calls if call[1] == "/rest/api/3/issue"]
+    assert [call[2] for call in single_posts] == [{"n": 1}]
+
+
+def test_batch_does_not_retry_after_a_failed_request(client):
+    client.bulk_response = FakeResponse(500, "server error")
+    results = jira.post_jira_issues_batch([{}, {}])
+    assert all(key is None for key, _ in results)
+    assert [call[1] for call in client.calls] == ["/rest/api/3/issue/bulk"]
+
+
+def test_plan_folds_levels_deeper_than_the_issue_types():
+    tasks = [{"title": "Epic", "subtasks": [{"title": "Task", "subtasks": [
+        {"title": "Sub", "subtasks": [{"title": "Deep"}]}
+    ]}]}]
+    epic, task, sub, deep = jira.plan_jira_nodes(tasks)
+    assert [node["level"] for node in (epic, task, sub, deep)] == [0, 1, 2, 2]
+    assert deep["parent"] is task
+    assert deep["summary"] == "Sub › Deep"
+    assert task["children"] == [sub, deep]
+
+
+def test_sync_creates_updates_and_closes_only_what_changed(client):
+    tasks = [{"title": "Epic", "description": "e", "subtasks": [{"title": "Task A"}, {"title": "Task B"}]}]
+    first = jira.sync_jira_issues(tasks, "tree", "PRJ")
+    assert [result["action"] for result in first] == ["created"] * 3
+
+    client.calls.clear()
+    assert {result["action"] for result in jira.sync_jira_issues(tasks, "tree", "PRJ")} == {"unchanged"}
+    assert client.calls == []
+
+    tasks[0]["description"] = "edited"
+    del tasks[0]["subtasks"][1]
+    actions = {result["title"]: result["action"] for result in jira.sync_jira_issues(tasks, "tree", "PRJ")}
+    assert actions == {"Epic": "updated", "Task A": "unchanged", "Task B": "closed"}
+
+
+def test_sync_state_is_scoped_per_tree(client):
+    jira.sync_jira_issues([{"title": "Doc A epic"}], "tree-a", "PRJ")
+    results = jira.sync_jira_issues([{"title": "Doc B epic"}], "tree-b", "PRJ")
+    assert [result["action"] for result in results] == ["created"]
+    assert not any(call[1].endswith("/transitions") for call in client.calls)
+    assert set(jira.load_jira_sync_state("PRJ", "tree-a")) != set(jira.load_jira_sync_state("PRJ", "tree-b"))
+
+
+def test_sync_adopts_journaled_issues_of_this_tree_only(client):
+    tasks_a = [{"id": "node-a", "title": "Doc A epic"}]
+    jira.sync_jira_issues(tasks_a, "tree-a", "PRJ")
+    # Losing the state file leaves only the journal
+    os.remove(jira.JIRA_SYNC_STATE_FILE)
+
+    client.calls.clear()
+    results = jira.sync_jira_issues([{"id": "node-b", "title": "Doc B epic"}], "tree-b", "PRJ")
+    assert [result["action"] for result in results] == ["created"]
+    assert not any(call[0] == "PUT" for call in client.calls)
+
+    results = jira.sync_jira_issues(tasks_a, "tree-a", "PRJ")
+    assert [(result["action"], result["key"]) for result in results] == [("updated", "FAKE-1")]
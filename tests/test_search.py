@@ -0,0 +1,79 @@
+from ai_project_manager.search import TaskSearchIndex, within_one_edit
+from ai_project_manager.tasks import TaskTree
+
+
+def make_index(*documents):
+    index = TaskSearchIndex()
+    for node_id, title, description in documents:
+        index.add(node_id, title, description)
+    return index
+
+
+def test_within_one_edit():
+    assert within_one_edit("login", "login")
+    assert within_one_edit("login", "logn")
+    assert within_one_edit("login", "logins")
+    assert within_one_edit("login", "lagin")
+    assert not within_one_edit("abxd", "abdy")
+    assert not within_one_edit("abcd", "acbd")
+    assert not within_one_edit("abc", "abcde")
+
+
+def test_exact_prefix_and_fuzzy_matches():
+    index = make_index(("1", "Authentication service", ""), ("2", "Payment page", "author bio"))
+    assert index.search("authentication") == ["1"]
+    assert index.search("authetication") == ["1"]   # one deletion
+    assert set(index.search("auth")) == {"1", "2"}   # prefix of both words
+    assert index.search("zzz") == []
+    assert index.search("   ") == []
+
+
+def test_fuzzy_rejects_two_edit_candidates_sharing_a_deletion():
+    index = make_index(("1", "abdy", ""))
+    assert index.search("abxd") == []
+
+
+def test_title_hits_rank_above_description_hits():
+    index = make_index(("desc", "Other", "invoice"), ("title", "Invoice export", ""))
+    assert index.search("invoice") == ["title", "desc"]
+
+
+def test_every_query_word_must_match():
+    index = make_index(("1", "Invoice export", ""), ("2", "Invoice import", ""))
+    assert index.search("invoice export") == ["1"]
+
+
+def test_limit_and_order_break_ties():
+    index = make_index(("b", "Report", ""), ("a", "Report", ""), ("c", "Report", ""))
+    assert index.search("report", order=lambda node_id: node_id) == ["a", "b", "c"]
+    assert index.search("report", limit=2, order=lambda node_id: node_id) == ["a", "b"]
+
+
+def test_remove_drops_words_no_document_uses():
+    index = make_index(("1", "Unique words", ""), ("2", "Shared words", ""))
+    index.remove("1")
+    assert index.search("unique") == []
+    assert "unique" not in index.vocabulary
+    assert index.search("words") == ["2"]
+
+
+def test_sync_follows_edits_additions_and_removals():
+    tree = TaskTree([{"id": "a", "title": "Login page"}, {"id": "b", "title": "Signup page"}])
+    index = TaskSearchIndex().sync(tree)
+    assert set(index.search("page")) == {"a", "b"}
+
+    tree.update("a", title="Logout button")
+    tree.remove("b")
+    added = tree.add("Password page")
+    index.sync(tree)
+    assert index.search("login") == []
+    assert index.search("logout") == ["a"]
+    assert index.search("page") == [added.id]
+
+
+def test_sync_replaces_a_new_tree_at_the_same_version():
+    first = TaskTree([{"id": "old", "title": "Login page"}])
+    index = TaskSearchIndex().sync(first)
+    second = TaskTree([{"id": "new", "title": "Login form"}])
+    assert first.version == second.version
+    assert index.sync(second).search("login") == ["new"]
@@ -0,0 +1,90 @@
+import json
+import random
+
+import pytest
+
+from ai_project_manager import summarize
+from ai_project_manager.summarize import (
+    IncrementalTaskParser, chunk_document, merge_task_lists, split_document_sections
+)
+
+TASKS = [
+    {"title": "Epic one", "description": 'tricky "quote" \\ { [ } ]', "subtasks": [
+        {"title": "Task", "description": "x", "subtasks": [{"title": "Sub", "description": "y"}]}
+    ]},
+    {"title": "Epic two", "description": "plain"},
+]
+
+
+def feed_in_pieces(parser, text, sizes):
+    tasks, position = [], 0
+    for size in sizes:
+        tasks += parser.feed(text[position:position + size])
+        position += size
+    return tasks
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_parser_yields_every_epic_whatever_the_piece_boundaries(seed):
+    raw = "```json\n" + json.dumps({"tasks": TASKS}, indent=2) + "\n```"
+    rng = random.Random(seed)
+    parser = IncrementalTaskParser()
+    assert feed_in_pieces(parser, raw, [rng.randint(1, 40) for _ in range(len(raw))]) == TASKS
+    assert parser.finished
+
+
+def test_parser_emits_an_epic_as_soon_as_it_closes():
+    parser = IncrementalTaskParser()
+    assert parser.feed('{"tasks": [{"title": "A"}, {"title": "B"') == [{"title": "A"}]
+    assert parser.feed('}]}') == [{"title": "B"}]
+    assert parser.finished
+
+
+def test_parser_is_unfinished_on_a_truncated_stream():
+    parser = IncrementalTaskParser()
+    parser.feed('{"tasks": [{"title": "A"}, {"title": "B", "descr')
+    assert not parser.finished
+
+
+def test_stream_summarize_raises_on_truncation(monkeypatch):
+    monkeypatch.setattr(summarize, "stream_with_gemini",
+                        lambda prompt, generation_config=None: iter(['{"tasks": [{"title": "A"}, {"ti']))
+    with pytest.raises(ValueError):
+        list(summarize.stream_summarize_with_gemini("short"))
+
+
+def test_stream_summarize_yields_the_growing_list(monkeypatch):
+    monkeypatch.setattr(summarize, "stream_with_gemini",
+                        lambda prompt, generation_config=None: iter(['{"tasks": [{"title": "A"},', ' {"title": "B"}]}']))
+    assert list(summarize.stream_summarize_with_gemini("short")) == [[{"title": "A"}], [{"title": "A"}, {"title": "B"}]]
+
+
+def test_split_document_sections_at_pages_and_headings():
+    text = "# Intro\nhello\n## Details\nmore\fPAGE TWO\nbody"
+    assert split_document_sections(text) == ["# Intro\nhello", "## Details\nmore", "PAGE TWO\nbody"]
+
+
+def test_chunk_document_respects_the_size_limit_and_keeps_everything():
+    text = "\n".join(f"# Section {idx}\n" + "word " * 30 for idx in range(20))
+    chunks = chunk_document(text, max_chars=400, overlap=0)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 400 for chunk in chunks)
+    for idx in range(20):
+        assert any(f"# Section {idx}\n" in chunk for chunk in chunks)
+
+
+def test_merge_task_lists_deduplicates_by_title_at_every_level():
+    merged = merge_task_lists([
+        [{"title": "Login", "description": "short", "subtasks": [{"title": "Form", "description": "a"}]}],
+        [{"title": "login!", "description": "the longer one", "subtasks": [{"title": "form", "description": "b"},
+                                                                          {"title": "Reset", "description": "c"}]}],
+    ])
+    assert merged == [{"title": "Login", "description": "the longer one", "subtasks": [
+        {"title": "Form", "description": "a"}, {"title": "Reset", "description": "c"}
+    ]}]
+
+
+def test_merge_task_lists_tolerates_null_descriptions_and_junk():
+    merged = merge_task_lists([[{"title": "A", "description": None}, "junk", {"description": "no title"}],
+                               [{"title": "A", "description": "filled"}]])
+    assert merged == [{"title": "A", "description": "filled"}]